@@ -1,58 +1,717 @@
 # Required Libraries
-import PyPDF2
+# Heavy libraries and models (PyPDF2, NLTK, scikit-learn, spaCy, transformers, ...)
+# are imported on first use so that importing AK stays fast; see warmup().
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+import os
 import re
-import docx
-import spacy
+import sys
+import atexit
+import csv
 import json
-import requests
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from fpdf import FPDF  # For PDF report generation
-from transformers import pipeline  # For summarization
-from sklearn.feature_extraction.text import CountVectorizer
-from language_tool_python import LanguageTool
-from googletrans import Translator
-
-# Ensure NLTK dependencies are available
-import nltk
-nltk.download('punkt')
-nltk.download('stopwords')
-
-
-# Function to Extract Text from PDF
-def extract_text(file_path):
-    try:
+import random
+import shutil
+import hashlib
+import tempfile
+import zlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import cached_property, lru_cache, wraps
+from itertools import chain, islice, repeat
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; appends are then only serialised per process
+    fcntl = None
+
+# Offline mode never downloads NLTK data; enable with AK_OFFLINE=1 or set_offline_mode()
+OFFLINE_MODE = os.environ.get("AK_OFFLINE", "").lower() in ("1", "true", "yes")
+# word_tokenize reads punkt_tab on NLTK >= 3.8.2 and punkt on older releases
+NLTK_RESOURCES = {"punkt": "tokenizers/punkt", "punkt_tab": "tokenizers/punkt_tab/english/",
+                  "stopwords": "corpora/stopwords"}
+SPACY_MODEL = "en_core_web_sm"
+
+_model_lock = threading.Lock()
+_nltk_ready = False
+_nlp = None
+
+
+# Function to Toggle Offline Mode
+def set_offline_mode(offline=True):
+    global OFFLINE_MODE
+    OFFLINE_MODE = offline
+
+
+# Function to Ensure NLTK Dependencies are Available (downloads only when online)
+def ensure_nltk_data():
+    global _nltk_ready
+    if _nltk_ready:
+        return
+    with _model_lock:
+        if _nltk_ready:
+            return
+        import nltk
+        for package, resource in NLTK_RESOURCES.items():
+            try:
+                nltk.data.find(resource)
+            except LookupError:
+                if not OFFLINE_MODE:
+                    nltk.download(package)
+        _nltk_ready = True
+
+
+# Function to Load the SpaCy Model once per process
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        with _model_lock:
+            if _nlp is None:
+                import spacy
+                _nlp = spacy.load(SPACY_MODEL)
+    return _nlp
+
+
+# Keep `AK.nlp` working for existing callers without loading spaCy at import time
+def __getattr__(name):
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Function to Load Models and Libraries up front (for long-lived workers)
+def warmup(entities=True, summarizer=False):
+    ensure_nltk_data()
+    preprocess_text("warm up")
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    import PyPDF2
+    if entities:
+        get_nlp()
+    if summarizer:
+        get_summarizer()
+
+
+# Pipeline instrumentation: per-stage timers, document/page/token/skill counters and
+# error counts, exported as JSON or Prometheus text. Off by default (AK_METRICS=1 or
+# enable_metrics()); while disabled every hook returns after a single flag check.
+class PipelineMetrics:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stage_seconds = {}
+            self.stage_calls = {}
+            self.stage_errors = {}
+            self.counters = {}
+
+    def incr(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_stage(self, name, seconds, error=False):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.stage_seconds[name] = self.stage_seconds.get(name, 0.0) + seconds
+            self.stage_calls[name] = self.stage_calls.get(name, 0) + 1
+            if error:
+                self.stage_errors[name] = self.stage_errors.get(name, 0) + 1
+
+    # Count a failure that the stage handled itself (the timer only sees raised exceptions)
+    def record_stage_error(self, name):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.stage_errors[name] = self.stage_errors.get(name, 0) + 1
+
+    def stage(self, name):
+        return _StageTimer(self, name) if self.enabled else _NULL_STAGE
+
+    def snapshot(self):
+        with self._lock:
+            return {"stages": {name: {"seconds": self.stage_seconds[name], "calls": self.stage_calls[name],
+                                      "errors": self.stage_errors.get(name, 0)} for name in self.stage_seconds},
+                    "counters": dict(self.counters)}
+
+    def export_json(self, path):
+        with open(path, 'w') as file:
+            json.dump(self.snapshot(), file, indent=4)
+
+    def export_prometheus(self, path):
+        snapshot = self.snapshot()
+        lines = ["# TYPE ak_stage_seconds_total counter", "# TYPE ak_stage_calls_total counter",
+                 "# TYPE ak_stage_errors_total counter"]
+        for name, stage in sorted(snapshot["stages"].items()):
+            lines.append(f'ak_stage_seconds_total{{stage="{name}"}} {stage["seconds"]:.6f}')
+            lines.append(f'ak_stage_calls_total{{stage="{name}"}} {stage["calls"]}')
+            lines.append(f'ak_stage_errors_total{{stage="{name}"}} {stage["errors"]}')
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE ak_{name}_total counter")
+            lines.append(f"ak_{name}_total {value}")
+        with open(path, 'w') as file:
+            file.write("\n".join(lines) + "\n")
+
+
+class _StageTimer:
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.metrics.record_stage(self.name, time.perf_counter() - self.started, error=exc_type is not None)
+        return False
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+metrics = PipelineMetrics(enabled=os.environ.get("AK_METRICS", "").lower() in ("1", "true", "yes"))
+
+
+def enable_metrics(enabled=True):
+    metrics.enabled = enabled
+    return metrics
+
+
+# Decorator to Time a Pipeline Function as a named stage
+def instrumented(stage_name):
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return function(*args, **kwargs)
+            with _StageTimer(metrics, stage_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Optional sampling profiler: a background thread samples the stacks of all other
+# threads every `interval` seconds; write_collapsed() emits flame-graph input
+class SamplingProfiler:
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.samples = {}
+        self._samples_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ak-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            keys = []
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                keys.append(";".join(reversed(stack)))
+            with self._samples_lock:
+                for key in keys:
+                    self.samples[key] = self.samples.get(key, 0) + 1
+
+    # Copy of the samples so far; safe to call while the profiler is running
+    def snapshot(self):
+        with self._samples_lock:
+            return dict(self.samples)
+
+    def top(self, n=10):
+        leaves = {}
+        for stack, count in self.snapshot().items():
+            leaf = stack.rsplit(";", 1)[-1]
+            leaves[leaf] = leaves.get(leaf, 0) + count
+        return sorted(leaves.items(), key=lambda item: item[1], reverse=True)[:n]
+
+    def write_collapsed(self, path):
+        with open(path, 'w') as file:
+            for stack, count in sorted(self.snapshot().items()):
+                file.write(f"{stack} {count}\n")
+
+
+# Function to Detect a Document's Format from its extension, falling back to its magic bytes
+def document_format(file_path):
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in (".pdf", ".docx"):
+        return extension[1:]
+    with open(file_path, 'rb') as file:
+        head = file.read(4)
+    if head.startswith(b"%PDF"):
+        return "pdf"
+    if head.startswith(b"PK"):
+        return "docx"
+    raise ValueError(f"Unsupported document format: {file_path}")
+
+
+# Function to Iterate a Document Lazily: one text unit per PDF page or DOCX paragraph
+def iter_document_units(file_path):
+    if document_format(file_path) == "pdf":
+        import PyPDF2
         with open(file_path, 'rb') as file:
             reader = PyPDF2.PdfReader(file)
-            text = ""
             for page in reader.pages:
-                text += page.extract_text()
-        return text
+                yield page.extract_text() or ""
+    else:
+        import docx
+        for paragraph in docx.Document(file_path).paragraphs:
+            yield paragraph.text
+
+
+# Function to Read a Document up to a Budget, returning (text, units_read) (raises on failure)
+# max_pages counts PDF pages or DOCX paragraphs; parsing stops as soon as a budget is met.
+def read_document(file_path, max_pages=None, max_chars=None):
+    separator = "" if document_format(file_path) == "pdf" else "\n"
+    if max_pages is not None and max_pages <= 0:
+        return "", 0
+    parts, chars, units_read = [], 0, 0
+    units = iter_document_units(file_path)
+    try:
+        for unit in units:
+            parts.append(unit)
+            units_read += 1
+            chars += len(unit) + len(separator)
+            # Stop before the generator parses the next unit
+            if max_pages is not None and units_read >= max_pages:
+                break
+            if max_chars is not None and chars >= max_chars:
+                break
+    finally:
+        units.close()
+    text = separator.join(parts)
+    return (text[:max_chars] if max_chars is not None else text), units_read
+
+
+# Function to Extract Text from a PDF or DOCX Resume, returning (text, error) instead of printing
+@instrumented("extract_text")
+def try_extract_text(file_path, max_pages=None, max_chars=None):
+    metrics.incr("documents")
+    try:
+        text, pages = read_document(file_path, max_pages, max_chars)
     except Exception as e:
-        print(f"Error extracting text: {e}")
-        return ""
+        metrics.incr("errors")
+        metrics.record_stage_error("extract_text")
+        return "", str(e)
+    metrics.incr("pages", pages)
+    return text, None
 
 
-# Function to Preprocess Text
-def preprocess_text(text):
-    stop_words = set(stopwords.words('english'))
-    text = re.sub(r'\s+', ' ', text)  # Remove extra spaces
-    text = re.sub(r'[^\w\s]', '', text)  # Remove punctuation
+# Function to Extract Text from a PDF or DOCX Resume
+def extract_text(file_path, max_pages=None, max_chars=None):
+    text, error = try_extract_text(file_path, max_pages, max_chars)
+    if error is not None:
+        print(f"Error extracting text: {error}")
+    return text
+
+
+# Worker for the parallel extraction pool (module level so it can be pickled)
+# Returns (path, text, error, pages, seconds); the parent records the metrics.
+def _extract_text_worker(file_path, max_pages=None, max_chars=None):
+    started = time.perf_counter()
+    try:
+        text, pages = read_document(file_path, max_pages, max_chars)
+        return file_path, text, None, pages, time.perf_counter() - started
+    except Exception as e:
+        return file_path, "", str(e), 0, time.perf_counter() - started
+
+
+# Function to Extract Text from Many Resumes in Parallel, yielding (path, text, error) as they finish
+def extract_texts_parallel(file_paths, max_workers=None, max_in_flight=None, max_pages=None, max_chars=None):
+    for file_path, text, error, pages, seconds in _bounded_pool(_extract_text_worker, file_paths, max_workers,
+                                                               max_in_flight, max_pages, max_chars):
+        _record_extraction(seconds, pages, error)
+        yield file_path, text, error
+
+
+# Function to Run a Worker over Paths in a Process Pool, yielding results as they finish
+# with at most max_in_flight files queued
+def _bounded_pool(worker, file_paths, max_workers=None, max_in_flight=None, *args):
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or max_workers * 2
+    paths = iter(file_paths)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        for file_path in paths:
+            pending.add(executor.submit(worker, file_path, *args))
+            if len(pending) >= max_in_flight:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                # Top the pool back up so at most max_in_flight files are queued
+                next_path = next(paths, None)
+                if next_path is not None:
+                    pending.add(executor.submit(worker, next_path, *args))
+
+
+# Record a worker's extraction in the parent's metrics
+def _record_extraction(seconds, pages, error):
+    metrics.record_stage("extract_text", seconds, error=error is not None)
+    metrics.incr("documents")
+    metrics.incr("pages", pages)
+    if error is not None:
+        metrics.incr("errors")
+
+
+# Bump whenever preprocess_text changes its output so cached results are invalidated
+PREPROCESS_VERSION = 1
+# Likewise for read_document; installed parser versions are part of the cache key too
+EXTRACT_VERSION = 1
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+
+
+# Function to Load the English Stopword Set once per process
+@lru_cache(maxsize=1)
+def _english_stop_words():
+    from nltk.corpus import stopwords
+    ensure_nltk_data()
+    return frozenset(stopwords.words('english'))
+
+
+# Function to Tokenize and Filter Text
+def preprocess_tokens(text):
+    from nltk.tokenize import word_tokenize
+    stop_words = _english_stop_words()
+    text = _WHITESPACE_RE.sub(' ', text)  # Remove extra spaces
+    text = _PUNCTUATION_RE.sub('', text)  # Remove punctuation
     tokens = word_tokenize(text.lower())
     filtered_tokens = [word for word in tokens if word not in stop_words]
-    return " ".join(filtered_tokens)
+    metrics.incr("tokens", len(filtered_tokens))
+    return filtered_tokens
+
+
+# Function to Preprocess Text
+@instrumented("preprocess_text")
+def preprocess_text(text):
+    return " ".join(preprocess_tokens(text))
+
+
+# Function to Preprocess Many Texts (a list or any iterator), optionally across processes
+def preprocess_batch(texts, n_jobs=1, chunksize=64):
+    if n_jobs == 1:
+        return [preprocess_text(text) for text in texts]
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        return list(executor.map(preprocess_text, texts, chunksize=chunksize))
+
+
+# Function to Describe the installed Document Parsers, so upgrading one invalidates the cache
+@lru_cache(maxsize=1)
+def _extractor_libraries():
+    from importlib import metadata
+    versions = []
+    for package in ("PyPDF2", "python-docx"):
+        try:
+            versions.append(f"{package}-{metadata.version(package)}")
+        except metadata.PackageNotFoundError:
+            versions.append(f"{package}-none")
+    return ";".join(versions)
+
+
+# Content-addressed on-disk cache of extracted and preprocessed resume text
+class ResumeTextCache:
+    def __init__(self, cache_dir=".resume_cache", max_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        # Least recently used entries first; access times survive restarts via file mtimes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        entries = []
+        for name in os.listdir(cache_dir):
+            if name.endswith(".json"):
+                stat = os.stat(os.path.join(cache_dir, name))
+                entries.append((stat.st_mtime, name[:-5], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for_file(file_path):
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b""):
+                digest.update(block)
+        digest.update(f"extract-v{EXTRACT_VERSION};{_extractor_libraries()};preprocess-v{PREPROCESS_VERSION}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            try:
+                with open(self._path(key), 'r') as file:
+                    entry = json.load(file)
+                os.utime(self._path(key))
+            except (OSError, ValueError):
+                self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        payload = json.dumps(entry).encode('utf-8')
+        with self._lock:
+            tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as file:
+                file.write(payload)
+            os.replace(tmp_path, self._path(key))
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(payload)
+            self._total_bytes += len(payload)
+            self._evict()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses,
+                "entries": len(self._entries), "bytes": self._total_bytes}
+
+
+# Function to Load a Resume's Text, Preprocessed Text and Tokens through the cache
+def load_resume_cached(file_path, cache):
+    key = cache.key_for_file(file_path)
+    entry = cache.get(key)
+    if entry is None:
+        text, error = try_extract_text(file_path)
+        if error is not None:
+            # Not cached, so the file is extracted again once the cause is fixed
+            print(f"Error extracting text: {error}")
+            return "", "", []
+        tokens = preprocess_tokens(text)
+        entry = {"text": text, "preprocessed": " ".join(tokens), "tokens": tokens}
+        cache.put(key, entry)
+    return entry["text"], entry["preprocessed"], entry["tokens"]
+
+
+# Worker for load_resumes_cached: extracts and tokenizes in the pool process
+# Returns (path, text, tokens, error, pages, seconds).
+def _load_resume_worker(file_path):
+    started = time.perf_counter()
+    try:
+        text, pages = read_document(file_path)
+        return file_path, text, preprocess_tokens(text), None, pages, time.perf_counter() - started
+    except Exception as e:
+        return file_path, "", [], str(e), 0, time.perf_counter() - started
+
+
+# Function to Load Many Resumes through the cache, yielding (path, text, preprocessed, tokens, error)
+# Files are looked up by content hash first and yielded straight from the cache; only misses
+# go to the process pool, and their results are cached unless extraction failed.
+def load_resumes_cached(file_paths, cache, max_workers=None, max_in_flight=None):
+    misses = {}
+    for file_path in file_paths:
+        try:
+            key = cache.key_for_file(file_path)
+        except OSError as e:
+            yield file_path, "", "", [], str(e)
+            continue
+        entry = cache.get(key)
+        if entry is None:
+            misses[file_path] = key
+        else:
+            yield file_path, entry["text"], entry["preprocessed"], entry["tokens"], None
+    for file_path, text, tokens, error, pages, seconds in _bounded_pool(_load_resume_worker, list(misses),
+                                                                        max_workers, max_in_flight):
+        _record_extraction(seconds, pages, error)
+        preprocessed = " ".join(tokens)
+        if error is None:
+            cache.put(misses[file_path], {"text": text, "preprocessed": preprocessed, "tokens": tokens})
+        yield file_path, text, preprocessed, tokens, error
+
+
+# Tokens keep the symbols used in skill names ("c++", "c#", "node.js") but drop trailing punctuation
+_SKILL_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+
+# Section keywords in the order parse_resume_sections checks them
+_SECTION_KEYWORDS = (("education", "Education"), ("experience", "Experience"), ("skills", "Skills"))
+_YEAR_RE = re.compile(r'\b(?:19|20)\d{2}\b')
+
+
+# A resume analysed once: the lowercase text, lines, tokens, section spans and year
+# mentions are computed on first access and shared by every heuristic check below
+class ResumeDocument:
+    def __init__(self, text):
+        self.text = text
+
+    @classmethod
+    def of(cls, text):
+        return text if isinstance(text, cls) else cls(text)
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def lines(self):
+        return self.text.split('\n')
+
+    @cached_property
+    def line_count(self):
+        return len(self.text.splitlines())
+
+    @cached_property
+    def tokens(self):
+        return _SKILL_TOKEN_RE.findall(self.lower)
+
+    # (section, first_line, end_line) runs; header lines themselves belong to no section
+    @cached_property
+    def section_spans(self):
+        spans = []
+        current_section, start = "Others", 0
+        for idx, line in enumerate(self.lower.split('\n')):
+            for keyword, section in _SECTION_KEYWORDS:
+                if keyword in line:
+                    spans.append((current_section, start, idx))
+                    current_section, start = section, idx + 1
+                    break
+        spans.append((current_section, start, len(self.lines)))
+        return spans
+
+    @cached_property
+    def sections(self):
+        sections = {"Education": [], "Experience": [], "Skills": [], "Others": []}
+        for section, start, end in self.section_spans:
+            sections[section].extend(self.lines[start:end])
+        return sections
+
+    @property
+    def has_section_headers(self):
+        return len(self.section_spans) > 1
 
+    @cached_property
+    def years(self):
+        return sorted(int(year) for year in _YEAR_RE.findall(self.text))
 
-# Function to Extract Skills
+    def keyword_hits(self, keywords):
+        return [word for word in keywords if word in self.lower]
+
+
+# Token trie over the skill taxonomy: every skill is found in one pass over a resume
+class SkillMatcher:
+    _END = object()
+
+    def __init__(self, skill_set):
+        self._trie = {}
+        for skill in skill_set:
+            tokens = _SKILL_TOKEN_RE.findall(skill.lower())
+            if not tokens:
+                continue
+            node = self._trie
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault(self._END, []).append(skill)
+
+    def find(self, text):
+        tokens = ResumeDocument.of(text).tokens
+        found = {}
+        for start in range(len(tokens)):
+            node = self._trie.get(tokens[start])
+            position = start + 1
+            while node is not None:
+                for skill in node.get(self._END, ()):
+                    found.setdefault(skill, None)
+                if position == len(tokens):
+                    break
+                node = node.get(tokens[position])
+                position += 1
+        metrics.incr("skills_matched", len(found))
+        return list(found)
+
+    def find_batch(self, texts):
+        return [self.find(text) for text in texts]
+
+
+_skill_matchers = OrderedDict()
+_skill_matchers_lock = threading.Lock()
+
+
+# Function to Get the Matcher for a Skill Set, cached by the identity of the set passed in so a
+# lookup costs nothing proportional to the taxonomy. The cache keeps the set alive (its id cannot
+# be reused) and rebuilds if the set's size changes; pass a SkillMatcher to skip the lookup.
+def _get_skill_matcher(skill_set):
+    if isinstance(skill_set, SkillMatcher):
+        return skill_set
+    key = id(skill_set)
+    with _skill_matchers_lock:
+        entry = _skill_matchers.get(key)
+        if entry is not None and entry[0] is skill_set and entry[1] == len(skill_set):
+            _skill_matchers.move_to_end(key)
+            return entry[2]
+    matcher = SkillMatcher(skill_set)
+    with _skill_matchers_lock:
+        _skill_matchers[key] = (skill_set, len(skill_set), matcher)
+        _skill_matchers.move_to_end(key)
+        while len(_skill_matchers) > 8:
+            _skill_matchers.popitem(last=False)
+    return matcher
+
+
+# Function to Extract Skills (skill_set may be a set of skill names or a prebuilt SkillMatcher)
+@instrumented("extract_skills")
 def extract_skills(text, skill_set):
-    extracted_skills = [skill for skill in skill_set if skill.lower() in text.lower()]
-    return extracted_skills
+    return _get_skill_matcher(skill_set).find(text)
 
 
 # Function to Match Resume to Job Description
 def match_resume_to_job(resume_text, job_description):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
     vectorizer = TfidfVectorizer()
     vectors = vectorizer.fit_transform([resume_text, job_description])
     similarity = cosine_similarity(vectors[0:1], vectors[1:2])
@@ -60,6 +719,7 @@ def match_resume_to_job(resume_text, job_description):
 
 
 # Function to Rank Resumes
+@instrumented("rank_resumes")
 def rank_resumes(resume_texts, job_description):
     rankings = []
     for resume_text in resume_texts:
@@ -68,6 +728,34 @@ def rank_resumes(resume_texts, job_description):
     return sorted(rankings, key=lambda x: x[1], reverse=True)
 
 
+# Function to Select the Indices of the Top-k Scores (highest first)
+def _top_k_indices(scores, top_k=None):
+    import numpy as np
+    scores = np.asarray(scores)
+    if top_k is None or top_k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    if top_k <= 0:
+        return np.array([], dtype=int)
+    candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+# Function to Rank Resumes in Batch (one vectorizer fit, one sparse product)
+@instrumented("rank_resumes")
+def rank_resumes_batch(resume_texts, job_description, top_k=None):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    resume_texts = list(resume_texts)
+    if not resume_texts:
+        return []
+    vectorizer = TfidfVectorizer()
+    vectorizer.fit(resume_texts + [job_description])
+    resume_matrix = vectorizer.transform(resume_texts)
+    job_vector = vectorizer.transform([job_description])
+    # Rows are L2-normalised, so the dot product is the cosine similarity
+    scores = (resume_matrix @ job_vector.T).toarray().ravel()
+    return [(resume_texts[i], float(scores[i])) for i in _top_k_indices(scores, top_k)]
+
+
 # Function to Load Skill Set
 def load_skill_set(skill_file):
     try:
@@ -79,12 +767,81 @@ def load_skill_set(skill_file):
         return set()
 
 
+# Process-wide summarization pipeline and a bounded cache of summaries by content hash
+SUMMARY_CACHE_SIZE = 1024
+_summarizer = None
+_summary_cache = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+
+# Function to Load the Summarization Pipeline once per process (CPU)
+def get_summarizer(num_threads=None):
+    global _summarizer
+    if _summarizer is None:
+        with _model_lock:
+            if _summarizer is None:
+                from transformers import pipeline
+                _summarizer = pipeline("summarization", device=-1)
+    if num_threads:
+        import torch
+        torch.set_num_threads(num_threads)
+    return _summarizer
+
+
+# Function to Split Text into Pieces that fit the Model Context
+def _chunk_for_model(text, tokenizer, max_tokens):
+    token_ids = tokenizer.encode(text, add_special_tokens=False)
+    if len(token_ids) <= max_tokens:
+        return [text]
+    return [tokenizer.decode(token_ids[i:i + max_tokens], skip_special_tokens=True)
+            for i in range(0, len(token_ids), max_tokens)]
+
+
+# Function to Summarize Many Texts in Batches (long texts are chunked, summaries cached)
+@instrumented("summarize")
+def summarize_texts(texts, max_length=150, min_length=30, batch_size=8, num_threads=None):
+    texts = list(texts)
+    summaries = [None] * len(texts)
+    pending = {}
+    with _summary_cache_lock:
+        for idx, text in enumerate(texts):
+            key = hashlib.sha256(f"{max_length}:{min_length}:{text}".encode('utf-8')).hexdigest()
+            if key in _summary_cache:
+                _summary_cache.move_to_end(key)
+                summaries[idx] = _summary_cache[key]
+            else:
+                pending.setdefault(key, []).append(idx)
+    if not pending:
+        return summaries
+
+    summarizer = get_summarizer(num_threads)
+    max_tokens = min(summarizer.tokenizer.model_max_length, 1024) - 16
+    chunks, owners = [], []
+    for key, indices in pending.items():
+        for chunk in _chunk_for_model(texts[indices[0]], summarizer.tokenizer, max_tokens):
+            chunks.append(chunk)
+            owners.append(key)
+    outputs = summarizer(chunks, max_length=max_length, min_length=min_length, do_sample=False,
+                         batch_size=batch_size, truncation=True)
+
+    parts = {}
+    for key, output in zip(owners, outputs):
+        parts.setdefault(key, []).append(output['summary_text'])
+    with _summary_cache_lock:
+        for key, indices in pending.items():
+            summary = " ".join(parts[key])
+            _summary_cache[key] = summary
+            for idx in indices:
+                summaries[idx] = summary
+        while len(_summary_cache) > SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+    return summaries
+
+
 # Function to Generate Summaries
 def generate_summary(text, max_length=150):
     try:
-        summarizer = pipeline("summarization")
-        summary = summarizer(text, max_length=max_length, min_length=30, do_sample=False)
-        return summary[0]['summary_text']
+        return summarize_texts([text], max_length=max_length)[0]
     except Exception as e:
         print(f"Error generating summary: {e}")
         return "Unable to summarize text."
@@ -95,8 +852,17 @@ def identify_skill_gaps(extracted_skills, required_skills):
     return list(required_skills - set(extracted_skills))
 
 
+# Rows rendered into the PDF by default; the rest go to the appendix (or are just counted)
+REPORT_TOP_N = 100
+
+
 # Function to Generate a PDF Report
-def generate_pdf_report(rankings, skill_gaps, output_path="resume_report.pdf"):
+# Rankings can be any iterator; only the first top_n rows go into the PDF (top_n=None renders all)
+# and the rest are streamed to appendix_path as CSV, so memory does not grow with the pool
+@instrumented("generate_pdf_report")
+def generate_pdf_report(rankings, skill_gaps, output_path="resume_report.pdf",
+                        top_n=REPORT_TOP_N, appendix_path=None, rows_per_page=None):
+    from fpdf import FPDF
     pdf = FPDF()
     pdf.set_auto_page_break(auto=True, margin=15)
     pdf.add_page()
@@ -109,9 +875,27 @@ def generate_pdf_report(rankings, skill_gaps, output_path="resume_report.pdf"):
     pdf.set_font("Arial", style="B", size=12)
     pdf.cell(0, 10, txt="Resume Rankings:", ln=True)
     pdf.set_font("Arial", size=12)
-    for idx, (resume, score) in enumerate(rankings, 1):
+    rankings = enumerate(rankings, 1)
+    # islice takes exactly top_n rows and leaves the rest of the iterator for the appendix
+    for idx, (resume, score) in islice(rankings, top_n):
+        if rows_per_page and idx > 1 and (idx - 1) % rows_per_page == 0:
+            pdf.add_page()
         pdf.cell(0, 10, txt=f"{idx}. Resume Score: {score:.2f}", ln=True)
 
+    remaining = 0
+    if appendix_path:
+        with open(appendix_path, 'w', newline='') as appendix:
+            writer = csv.writer(appendix)
+            writer.writerow(["rank", "score", "resume"])
+            for idx, (resume, score) in rankings:
+                writer.writerow([idx, f"{score:.4f}", resume[:100]])
+                remaining += 1
+    else:
+        remaining = sum(1 for _ in rankings)
+    if remaining:
+        where = f" (see {appendix_path})" if appendix_path else ""
+        pdf.cell(0, 10, txt=f"... {remaining} more resumes not shown{where}", ln=True)
+
     pdf.ln(10)
 
     # Skill Gaps
@@ -127,6 +911,7 @@ def generate_pdf_report(rankings, skill_gaps, output_path="resume_report.pdf"):
 
 def extract_keywords(text, top_n=10):
     try:
+        from sklearn.feature_extraction.text import CountVectorizer
         vectorizer = CountVectorizer(stop_words='english', max_features=top_n)
         term_matrix = vectorizer.fit_transform([text])
         keywords = vectorizer.get_feature_names_out()
@@ -135,70 +920,230 @@ def extract_keywords(text, top_n=10):
         print(f"Error extracting keywords: {e}")
         return []
 
-# Load a pretrained SpaCy model
-nlp = spacy.load("en_core_web_sm")
+# Pipeline components that entity extraction never reads from
+NER_DISABLED_PIPES = ("tagger", "parser", "attribute_ruler", "lemmatizer", "senter")
+
+
+def _entities_from_doc(doc):
+    entities = {ent.label_: [] for ent in doc.ents}
+    for ent in doc.ents:
+        entities[ent.label_].append(ent.text)
+    return entities
+
 
+@instrumented("extract_entities")
 def extract_entities(text):
     try:
-        doc = nlp(text)
-        entities = {ent.label_: [] for ent in doc.ents}
-        for ent in doc.ents:
-            entities[ent.label_].append(ent.text)
-        return entities
+        return _entities_from_doc(get_nlp()(text))
     except Exception as e:
         print(f"Error extracting entities: {e}")
         return {}
+
+
+# Function to Extract Entities from Many Texts with nlp.pipe (results stream back in input order)
+def extract_entities_batch(texts, batch_size=64, n_process=1):
+    nlp = get_nlp()
+    disabled = [name for name in NER_DISABLED_PIPES if name in nlp.pipe_names]
+    for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process, disable=disabled):
+        yield _entities_from_doc(doc)
         
 def find_missing_skills_in_job(extracted_skills, job_description_skills):
     return [skill for skill in extracted_skills if skill not in job_description_skills]
 
 def parse_resume_sections(text):
-    sections = {
-        "Education": [],
-        "Experience": [],
-        "Skills": [],
-        "Others": []
-    }
-    current_section = "Others"
-    for line in text.split('\n'):
-        if "education" in line.lower():
-            current_section = "Education"
-        elif "experience" in line.lower():
-            current_section = "Experience"
-        elif "skills" in line.lower():
-            current_section = "Skills"
-        else:
-            sections[current_section].append(line)
-    return sections
+    return {section: list(lines) for section, lines in ResumeDocument.of(text).sections.items()}
     
 def calculate_job_suitability(resume_text, job_descriptions):
     scores = {}
-    for idx, job in enumerate(job_descriptions, 1):
-        score = match_resume_to_job(resume_text, preprocess_text(job))
+    for idx, job in enumerate(preprocess_batch(job_descriptions), 1):
+        score = match_resume_to_job(resume_text, job)
         scores[f"Job {idx}"] = score
     return scores
+
+
+# Function to Match Many Resumes against Many Jobs in one shared vocabulary
+# Returns top-k (resume_index, score) per job and top-k (job_index, score) per resume.
+@instrumented("match_resumes_to_jobs")
+def match_resumes_to_jobs(resume_texts, job_descriptions, top_k=10, block_size=2048):
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    resume_texts = list(resume_texts)
+    job_descriptions = list(job_descriptions)
+    n_resumes, n_jobs = len(resume_texts), len(job_descriptions)
+    if not n_resumes or not n_jobs:
+        return {"top_candidates_per_job": [[] for _ in job_descriptions],
+                "top_jobs_per_candidate": [[] for _ in resume_texts]}
+
+    vectorizer = TfidfVectorizer()
+    vectorizer.fit(resume_texts + job_descriptions)
+    resume_matrix = vectorizer.transform(resume_texts)
+    job_matrix_t = vectorizer.transform(job_descriptions).T.tocsc()
+
+    k_jobs = min(top_k, n_jobs)
+    best_scores = np.full((n_jobs, 0), -np.inf)
+    best_resumes = np.empty((n_jobs, 0), dtype=np.int64)
+    top_jobs_per_candidate = []
+    # Only one block_size x n_jobs slice of the similarity matrix is dense at a time
+    for start in range(0, n_resumes, block_size):
+        block = (resume_matrix[start:start + block_size] @ job_matrix_t).toarray()
+        for row in block:
+            order = _top_k_indices(row, k_jobs)
+            top_jobs_per_candidate.append([(int(j), float(row[j])) for j in order])
+
+        scores = np.hstack([best_scores, block.T])
+        resumes = np.hstack([best_resumes, np.broadcast_to(np.arange(start, start + block.shape[0]), block.T.shape)])
+        keep = min(top_k, scores.shape[1])
+        if keep < scores.shape[1]:
+            selected = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+            scores = np.take_along_axis(scores, selected, axis=1)
+            resumes = np.take_along_axis(resumes, selected, axis=1)
+        best_scores, best_resumes = scores, resumes
+
+    top_candidates_per_job = []
+    for job_scores, job_resumes in zip(best_scores, best_resumes):
+        order = np.lexsort((job_resumes, -job_scores))
+        top_candidates_per_job.append([(int(job_resumes[i]), float(job_scores[i])) for i in order])
+    return {"top_candidates_per_job": top_candidates_per_job,
+            "top_jobs_per_candidate": top_jobs_per_candidate}
     
 
-def generate_summary_report(ranked_resumes, skill_gaps, output_path="summary_report.json"):
-    report = {
-        "ranked_resumes": [{"score": score, "resume": text[:100] + "..."} for text, score in ranked_resumes],
-        "skill_gaps": skill_gaps
-    }
+# Rankings are written as they are consumed: a streamed JSON object by default, or
+# JSON Lines (one skill-gap header line, then one line per resume) with json_lines=True
+@instrumented("generate_summary_report")
+def generate_summary_report(ranked_resumes, skill_gaps, output_path="summary_report.json", json_lines=False):
     with open(output_path, 'w') as file:
-        json.dump(report, file, indent=4)
+        if json_lines:
+            file.write(json.dumps({"skill_gaps": list(skill_gaps)}) + "\n")
+            for rank, (text, score) in enumerate(ranked_resumes, 1):
+                file.write(json.dumps({"rank": rank, "score": float(score), "resume": text[:100] + "..."}) + "\n")
+        else:
+            file.write('{\n    "ranked_resumes": [')
+            separator = "\n        "
+            for text, score in ranked_resumes:
+                file.write(separator + json.dumps({"score": float(score), "resume": text[:100] + "..."}))
+                separator = ",\n        "
+            file.write('\n    ],\n    "skill_gaps": ' + json.dumps(list(skill_gaps)) + '\n}\n')
     print(f"Summary report saved to {output_path}")
     
 
-def fetch_job_description_from_api(api_url, api_key, job_id):
-    headers = {"Authorization": f"Bearer {api_key}"}
-    response = requests.get(f"{api_url}/jobs/{job_id}", headers=headers)
-    if response.status_code == 200:
-        return response.json().get("job_description", "")
-    else:
+# Job description fetcher: one pooled requests.Session shared by concurrent fetches, an
+# on-disk cache revalidated with ETag / If-Modified-Since, and exponential backoff on
+# 429 and 5xx responses (honouring Retry-After)
+class JobDescriptionFetcher:
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, api_url, api_key, cache_dir=".job_cache", max_workers=8,
+                 timeout=10.0, max_retries=4, backoff=0.5, max_backoff=30.0):
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.api_url = api_url.rstrip("/")
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {api_key}"
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def close(self):
+        self.session.close()
+
+    def _cache_path(self, job_id):
+        key = hashlib.sha256(f"{self.api_url}/jobs/{job_id}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_cached(self, job_id):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_path(job_id), 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _store_cached(self, job_id, entry):
+        if not self.cache_dir:
+            return
+        path = self._cache_path(job_id)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as file:
+            json.dump(entry, file)
+        os.replace(tmp_path, path)
+
+    def _retry_delay(self, response, attempt):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * (2 ** attempt) * (0.5 + random.random() / 2), self.max_backoff)
+
+    def fetch(self, job_id):
+        import requests
+        cached = self._load_cached(job_id)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        url = f"{self.api_url}/jobs/{job_id}"
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                if attempt == self.max_retries:
+                    print(f"Failed to fetch job description: {e}")
+                    return ""
+                time.sleep(self._retry_delay(None, attempt))
+                continue
+            if response.status_code not in self.RETRY_STATUSES or attempt == self.max_retries:
+                break
+            time.sleep(self._retry_delay(response, attempt))
+
+        if response.status_code == 304 and cached:
+            return cached["job_description"]
+        if response.status_code == 200:
+            job_description = response.json().get("job_description", "")
+            self._store_cached(job_id, {"job_description": job_description,
+                                        "etag": response.headers.get("ETag"),
+                                        "last_modified": response.headers.get("Last-Modified")})
+            return job_description
         print(f"Failed to fetch job description: {response.status_code}")
         return ""
 
+    # Function to Fetch Many Jobs concurrently, returning {job_id: job_description}
+    def fetch_many(self, job_ids):
+        job_ids = list(job_ids)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return dict(zip(job_ids, executor.map(self.fetch, job_ids)))
+
+
+_job_fetchers = {}
+_job_fetchers_lock = threading.Lock()
+
+
+# Function to Get the Shared Fetcher (and its connection pool) for an API
+def get_job_fetcher(api_url, api_key):
+    with _job_fetchers_lock:
+        fetcher = _job_fetchers.get((api_url, api_key))
+        if fetcher is None:
+            fetcher = _job_fetchers[(api_url, api_key)] = JobDescriptionFetcher(api_url, api_key)
+        return fetcher
+
+
+def fetch_job_description_from_api(api_url, api_key, job_id):
+    return get_job_fetcher(api_url, api_key).fetch(job_id)
+
+@instrumented("recommend_candidates")
 def recommend_candidates(candidate_data, job_description):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
     vectorizer = TfidfVectorizer()
     vectors = vectorizer.fit_transform(candidate_data + [job_description])
     similarities = cosine_similarity(vectors[-1], vectors[:-1])
@@ -206,43 +1151,458 @@ def recommend_candidates(candidate_data, job_description):
         enumerate(similarities[0]), key=lambda x: x[1], reverse=True
     )
     return ranked_candidates
-    
-def collect_feedback(resume_id, feedback_text, feedback_log="feedback.txt"):
+
+
+# On-disk candidate index: fitted vocabulary and IDF weights plus an L2-normalised
+# TF-IDF matrix stored column-major (one posting list per term) so a query only
+# touches the postings of its own terms. Candidates can be added or removed without
+# refitting; new candidates are weighted with the IDF fitted at build time.
+# Each save() writes a new generation directory and atomically repoints CURRENT at it,
+# so processes that memory-mapped an earlier generation keep reading consistent files.
+class CandidateIndex:
+    def __init__(self, vocabulary, idf, matrix, candidate_ids):
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self._vectorizer = None
+        self._matrix = matrix
+        self._added = []
+        self.candidate_ids = list(candidate_ids)
+        self._rows = {candidate_id: row for row, candidate_id in enumerate(self.candidate_ids)}
+        self._removed = set()
+
+    @classmethod
+    def build(cls, candidate_texts, candidate_ids=None):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        candidate_texts = list(candidate_texts)
+        if candidate_ids is None:
+            candidate_ids = range(len(candidate_texts))
+        vectorizer = TfidfVectorizer()
+        matrix = vectorizer.fit_transform(candidate_texts).tocsc()
+        vocabulary = {term: int(column) for term, column in vectorizer.vocabulary_.items()}
+        return cls(vocabulary, vectorizer.idf_, matrix, candidate_ids)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _vectorize(self, texts):
+        from sklearn.preprocessing import normalize
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import CountVectorizer
+            # Validating a large fixed vocabulary dominates a query; do it once per index
+            self._vectorizer = CountVectorizer(vocabulary=self.vocabulary)
+        counts = self._vectorizer.transform(texts)
+        return normalize(counts.multiply(self.idf).tocsr())
+
+    def add(self, candidate_texts, candidate_ids):
+        candidate_ids = list(candidate_ids)
+        self.remove(candidate_id for candidate_id in candidate_ids if candidate_id in self._rows)
+        self._added.append(self._vectorize(list(candidate_texts)).tocsc())
+        for candidate_id in candidate_ids:
+            self._rows[candidate_id] = len(self.candidate_ids)
+            self.candidate_ids.append(candidate_id)
+
+    def remove(self, candidate_ids):
+        for candidate_id in candidate_ids:
+            row = self._rows.pop(candidate_id, None)
+            if row is not None:
+                self._removed.add(row)
+
+    def _blocks(self):
+        return [self._matrix] + self._added
+
+    def query(self, job_description, top_k=10):
+        import numpy as np
+        job_vector = self._vectorize([job_description])
+        columns, weights = job_vector.indices, job_vector.data
+        scores = np.concatenate([block[:, columns] @ weights for block in self._blocks()])
+        if self._removed:
+            scores[list(self._removed)] = -np.inf
+        return [(self.candidate_ids[row], float(scores[row]))
+                for row in _top_k_indices(scores, top_k) if scores[row] != -np.inf]
+
+    def save(self, path):
+        import numpy as np
+        import scipy.sparse
+        matrix = scipy.sparse.vstack(self._blocks(), format="csr")
+        keep = [row for row in range(matrix.shape[0]) if row not in self._removed]
+        matrix = matrix[keep].tocsc()
+        candidate_ids = [self.candidate_ids[row] for row in keep]
+        os.makedirs(path, exist_ok=True)
+        previous = self._current_generation(path)
+        generation = tempfile.mkdtemp(prefix="gen-", dir=path)
+        for name in ("data", "indices", "indptr"):
+            np.save(os.path.join(generation, f"{name}.npy"), getattr(matrix, name))
+        np.save(os.path.join(generation, "idf.npy"), self.idf)
+        with open(os.path.join(generation, "index.json"), 'w') as file:
+            json.dump({"shape": list(matrix.shape), "vocabulary": self.vocabulary,
+                       "candidate_ids": candidate_ids}, file)
+        pointer = os.path.join(generation, "CURRENT")
+        with open(pointer, 'w') as file:
+            file.write(os.path.basename(generation))
+        os.replace(pointer, os.path.join(path, "CURRENT"))
+        # Retire the generation this one replaced. Unlinking keeps the pages of files that are
+        # already mapped alive; a reader that had not opened them yet retries in load().
+        if previous != path:
+            shutil.rmtree(previous, ignore_errors=True)
+        vectorizer = self._vectorizer
+        self.__init__(self.vocabulary, self.idf, matrix, candidate_ids)
+        self._vectorizer = vectorizer
+
+    # Directory holding the current generation (the index directory itself for indexes
+    # saved before generations were introduced)
+    @staticmethod
+    def _current_generation(path):
+        try:
+            with open(os.path.join(path, "CURRENT"), 'r') as file:
+                return os.path.join(path, file.read().strip())
+        except FileNotFoundError:
+            return path
+
+    @classmethod
+    def load(cls, path, mmap=True, attempts=3):
+        import numpy as np
+        import scipy.sparse
+        mmap_mode = 'r' if mmap else None
+        for attempt in range(attempts):
+            generation = cls._current_generation(path)
+            try:
+                with open(os.path.join(generation, "index.json"), 'r') as file:
+                    meta = json.load(file)
+                arrays = [np.load(os.path.join(generation, f"{name}.npy"), mmap_mode=mmap_mode)
+                          for name in ("data", "indices", "indptr")]
+                idf = np.load(os.path.join(generation, "idf.npy"))
+            except FileNotFoundError:
+                # A concurrent save() retired this generation; follow CURRENT again
+                if attempt == attempts - 1:
+                    raise
+                continue
+            matrix = scipy.sparse.csc_matrix(tuple(arrays), shape=tuple(meta["shape"]), copy=False)
+            return cls(meta["vocabulary"], idf, matrix, meta["candidate_ids"])
+
+# Lines written by the old free-text collect_feedback format are still readable
+_LEGACY_FEEDBACK_RE = re.compile(r"^Resume ID: (.*?), Feedback: (.*)$")
+
+
+# Append-only feedback log of JSON Lines records. Appends are buffered and written in
+# one locked write, at the latest flush_interval seconds after they were added (fsync at
+# most every fsync_interval seconds); an index from resume ID to record offsets makes
+# lookups O(1). Several workers may share one file.
+class FeedbackStore:
+    def __init__(self, path="feedback.txt", flush_every=100, flush_interval=1.0, fsync_interval=5.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self._buffer = []
+        self._index = {}
+        self._indexed_bytes = 0
+        self._last_flush = self._last_fsync = time.monotonic()
+        self._lock = threading.Lock()
+        self._timer = None
+        self.refresh()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _parse(line):
+        line = line.decode('utf-8').rstrip("\n")
+        try:
+            return json.loads(line)
+        except ValueError:
+            match = _LEGACY_FEEDBACK_RE.match(line)
+            return {"resume_id": match.group(1), "feedback": match.group(2)} if match else None
+
+    # Index records appended since the last scan, including those written by other workers
+    def _scan(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as file:
+            file.seek(self._indexed_bytes)
+            offset = self._indexed_bytes
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break  # Another worker is still writing this record
+                record = self._parse(line)
+                if record is not None:
+                    self._index.setdefault(str(record["resume_id"]), []).append(offset)
+                offset += len(line)
+            self._indexed_bytes = offset
+
+    def refresh(self):
+        with self._lock:
+            self._scan()
+
+    def add(self, resume_id, feedback_text, **fields):
+        record = dict(fields, resume_id=resume_id, feedback=feedback_text, timestamp=time.time())
+        with self._lock:
+            self._buffer.append(json.dumps(record) + "\n")
+            if len(self._buffer) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+            elif self._timer is None:
+                # Deadline flush, so the last records of a worker that goes idle still reach the log
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush(self, fsync=False):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        payload = "".join(self._buffer).encode('utf-8')
+        with open(self.path, 'ab') as file:
+            if fcntl is not None:
+                fcntl.flock(file, fcntl.LOCK_EX)
+            file.write(payload)
+            file.flush()
+            if fsync or self._last_flush - self._last_fsync >= self.fsync_interval:
+                os.fsync(file.fileno())
+                self._last_fsync = self._last_flush
+        self._buffer = []
+
+    def flush(self, fsync=False):
+        with self._lock:
+            self._flush(fsync)
+
+    def close(self):
+        self.flush(fsync=True)
+
+    def get(self, resume_id):
+        with self._lock:
+            self._flush()
+            self._scan()
+            offsets = self._index.get(str(resume_id), [])
+            records = []
+            if offsets:
+                with open(self.path, 'rb') as file:
+                    for offset in offsets:
+                        file.seek(offset)
+                        records.append(self._parse(file.readline()))
+            return records
+
+    def resume_ids(self):
+        with self._lock:
+            self._flush()
+            self._scan()
+            return list(self._index)
+
+
+_feedback_stores = {}
+_feedback_stores_lock = threading.Lock()
+
+
+# Function to Get the Shared Feedback Store for a Log File (flushed at exit)
+def get_feedback_store(feedback_log="feedback.txt"):
+    with _feedback_stores_lock:
+        store = _feedback_stores.get(feedback_log)
+        if store is None:
+            store = _feedback_stores[feedback_log] = FeedbackStore(feedback_log)
+            atexit.register(store.close)
+        return store
+
+
+# Record one piece of feedback; by default it is written through before reporting success
+def collect_feedback(resume_id, feedback_text, feedback_log="feedback.txt", flush=True):
     try:
-        with open(feedback_log, "a") as log:
-            log.write(f"Resume ID: {resume_id}, Feedback: {feedback_text}\n")
+        store = get_feedback_store(feedback_log)
+        store.add(resume_id, feedback_text)
+        if flush:
+            store.flush()
         print("Feedback recorded successfully.")
     except Exception as e:
         print(f"Error recording feedback: {e}")
 
 def detect_overqualification(resume_text, job_description):
     overqualified_keywords = ["senior", "lead", "manager", "director", "advanced"]
-    resume_keywords = [word for word in overqualified_keywords if word in resume_text.lower()]
-    job_keywords = [word for word in overqualified_keywords if word in job_description.lower()]
+    resume_keywords = ResumeDocument.of(resume_text).keyword_hits(overqualified_keywords)
+    job_keywords = ResumeDocument.of(job_description).keyword_hits(overqualified_keywords)
     return len(resume_keywords) > len(job_keywords)
 
 def check_resume_formatting(text):
+    document = ResumeDocument.of(text)
     issues = []
-    if not any(header in text.lower() for header in ["education", "experience", "skills"]):
+    if not document.has_section_headers:
         issues.append("Missing key sections (Education, Experience, Skills).")
-    if len(text.splitlines()) < 10:
+    if document.line_count < 10:
         issues.append("Resume might be too short.")
     return issues if issues else ["No formatting issues detected."]
 
 def weighted_skill_score(extracted_skills, weighted_skills):
     total_weight = 0
     matched_weight = 0
+    extracted = {s.lower() for s in extracted_skills}
     for skill, weight in weighted_skills.items():
         total_weight += weight
-        if skill.lower() in [s.lower() for s in extracted_skills]:
+        if skill.lower() in extracted:
             matched_weight += weight
     return matched_weight / total_weight if total_weight > 0 else 0
 
-def detect_career_gaps(text):
-    import re
-    years = re.findall(r'\b(19|20)\d{2}\b', text)
-    years = sorted(map(int, years))
-    gaps = [(years[i], years[i+1]) for i in range(len(years) - 1) if years[i+1] - years[i]]
+# Function to Encode Candidates' Skills as a Sparse Binary Candidate x Skill Matrix
+def _candidate_skill_matrix(extracted_skills_list, column_of, n_columns, normalize=None):
+    import numpy as np
+    import scipy.sparse
+    if not isinstance(extracted_skills_list, (list, tuple)):
+        extracted_skills_list = list(extracted_skills_list)
+    lengths = np.fromiter(map(len, extracted_skills_list), dtype=np.int64, count=len(extracted_skills_list))
+    skills = chain.from_iterable(extracted_skills_list)
+    if normalize is not None:
+        skills = map(normalize, skills)
+    columns = np.fromiter(map(column_of.get, skills, repeat(-1)), dtype=np.int64, count=int(lengths.sum()))
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    known = columns >= 0
+    matrix = scipy.sparse.csr_matrix((np.ones(int(known.sum())), (rows[known], columns[known])),
+                                     shape=(len(lengths), n_columns))
+    matrix.sum_duplicates()
+    matrix.data[:] = 1  # A skill listed twice still counts once
+    return matrix
+
+# Function to Score Many Candidates against one Weighted Skill Profile (same result as weighted_skill_score)
+def weighted_skill_score_batch(extracted_skills_list, weighted_skills):
+    import numpy as np
+    # Profile skills differing only in case share a column and add their weights
+    column_of = {}
+    for skill in weighted_skills:
+        column_of.setdefault(skill.lower(), len(column_of))
+    weights = np.zeros(len(column_of))
+    for skill, weight in weighted_skills.items():
+        weights[column_of[skill.lower()]] += weight
+    matrix = _candidate_skill_matrix(extracted_skills_list, column_of, len(weights), str.lower)
+    total_weight = weights.sum()
+    if total_weight <= 0:
+        return np.zeros(matrix.shape[0])
+    return (matrix @ weights) / total_weight
+
+# Function to Identify Skill Gaps for Many Candidates (same result as identify_skill_gaps, sorted)
+def identify_skill_gaps_batch(extracted_skills_list, required_skills):
+    import numpy as np
+    required = sorted(required_skills)
+    column_of = {skill: column for column, skill in enumerate(required)}
+    matrix = _candidate_skill_matrix(extracted_skills_list, column_of, len(required))
+    missing = matrix.toarray() == 0
+    required = np.array(required, dtype=object)
+    return [required[row].tolist() for row in missing]
+
+def detect_career_gaps(text, min_gap=1):
+    years = ResumeDocument.of(text).years
+    gaps = [(years[i], years[i+1]) for i in range(len(years) - 1) if years[i+1] - years[i] >= min_gap]
+    return gaps
+
+# Near-duplicate detection: MinHash signatures over word shingles, bucketed by LSH bands
+# so only resumes sharing a band are compared (roughly linear in the pool size)
+class MinHashLSH:
+    _PRIME = (1 << 31) - 1
+
+    def __init__(self, threshold=0.8, num_perm=128, shingle_size=5, seed=1):
+        import numpy as np
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.bands, self.rows = self._band_layout(threshold, num_perm)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, self._PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, self._PRIME, num_perm, dtype=np.uint64)
+        self._tables = [{} for _ in range(self.bands)]
+        self._signatures = {}
+
+    # Pick the band layout whose S-curve threshold (1/b)^(1/r) sits just below the target,
+    # so true duplicates rarely miss a bucket; signatures filter the extra candidates
+    @staticmethod
+    def _band_layout(threshold, num_perm):
+        layouts = [(bands, num_perm // bands) for bands in range(1, num_perm + 1) if num_perm % bands == 0]
+        midpoint = lambda layout: (1.0 / layout[0]) ** (1.0 / layout[1])
+        below = [layout for layout in layouts if midpoint(layout) <= threshold]
+        return max(below or layouts[-1:], key=midpoint)
+
+    def __len__(self):
+        return len(self._signatures)
+
+    # Signature of a text, or None when it has no tokens (e.g. a failed extraction), since
+    # every empty text would otherwise share one signature and match the others
+    def signature(self, text):
+        import numpy as np
+        tokens = re.findall(r"\w+", text.lower())
+        if not tokens:
+            return None
+        k = self.shingle_size
+        shingles = {" ".join(tokens[i:i + k]) for i in range(max(len(tokens) - k + 1, 1))}
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) % self._PRIME for shingle in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % self._PRIME).min(axis=1)
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def query(self, text=None, signature=None):
+        if signature is None:
+            signature = self.signature(text)
+            if signature is None:
+                return []
+        candidates = set()
+        for table, band_key in zip(self._tables, self._band_keys(signature)):
+            candidates.update(table.get(band_key, ()))
+        matches = []
+        for key in candidates:
+            similarity = float((self._signatures[key] == signature).mean())
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    # Function to Insert a Resume, returning the already indexed resumes it duplicates
+    # Resumes without any tokens are not indexed.
+    def add(self, key, text=None, signature=None):
+        if signature is None:
+            signature = self.signature(text)
+            if signature is None:
+                return []
+        matches = [match for match in self.query(signature=signature) if match[0] != key]
+        self._signatures[key] = signature
+        for table, band_key in zip(self._tables, self._band_keys(signature)):
+            table.setdefault(band_key, []).append(key)
+        return matches
+
+    def save(self, path):
+        import numpy as np
+        keys = list(self._signatures)
+        signatures = np.array([self._signatures[key] for key in keys], dtype=np.uint64).reshape(-1, self.num_perm)
+        meta = {"threshold": self.threshold, "num_perm": self.num_perm,
+                "shingle_size": self.shingle_size, "seed": self.seed, "keys": keys}
+        with open(path, 'wb') as file:
+            np.savez(file, signatures=signatures, meta=np.array(json.dumps(meta)))
+
+    @classmethod
+    def load(cls, path):
+        import numpy as np
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            signatures = data["signatures"]
+        lsh = cls(meta["threshold"], meta["num_perm"], meta["shingle_size"], meta["seed"])
+        for key, signature in zip(meta["keys"], signatures):
+            lsh.add(key, signature=signature)
+        return lsh
+
+
+# Function to Detect Near-Duplicate Resumes, returning (earlier_key, later_key, similarity)
+# Pass a persisted MinHashLSH to check new arrivals against previously seen resumes.
+def check_duplicates(resume_texts, threshold=0.8, keys=None, lsh=None):
+    lsh = lsh if lsh is not None else MinHashLSH(threshold=threshold)
+    resume_texts = list(resume_texts)
+    keys = list(keys) if keys is not None else list(range(len(resume_texts)))
+    duplicates = []
+    for key, text in zip(keys, resume_texts):
+        for other_key, similarity in lsh.add(key, text):
+            duplicates.append((other_key, key, similarity))
+    return duplicates
+
+
+# Seconds spent executing this module's top level (kept low by the lazy imports above)
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
 
 # Main Script
 if __name__ == "__main__":
@@ -252,6 +1612,15 @@ if __name__ == "__main__":
     skill_file_path = "skills.txt"
     feedback_log = "feedback.txt"  # Log for feedback collection
 
+    # Export stage timings and counters on exit (AK_METRICS=1), optionally with a sampled profile (AK_PROFILE=1)
+    if metrics.enabled:
+        atexit.register(metrics.export_prometheus, "pipeline_metrics.prom")
+        atexit.register(metrics.export_json, "pipeline_metrics.json")
+    if os.environ.get("AK_PROFILE"):
+        profiler = SamplingProfiler().start()
+        atexit.register(profiler.write_collapsed, "pipeline_profile.txt")
+        atexit.register(profiler.stop)
+
     # Load job description and skills
     try:
         with open(job_description_path, 'r') as jd_file:
@@ -261,29 +1630,37 @@ if __name__ == "__main__":
         job_description = ""
 
     skill_set = load_skill_set(skill_file_path)
+    skill_matcher = SkillMatcher(skill_set)
 
     # Process resumes
     processed_resumes = []
     extracted_skills_all = []
-    for resume_path in resumes:
+    resume_texts = {}
+    documents = {}
+    # Resubmitted resumes come straight from the text cache (no PDF parsing or tokenizing)
+    resume_cache = ResumeTextCache(os.environ.get("AK_RESUME_CACHE", ".resume_cache"))
+    for resume_path, resume_text, preprocessed_text, _, error in load_resumes_cached(resumes, resume_cache):
         print(f"Processing {resume_path}...")
-        resume_text = extract_text(resume_path)
-        preprocessed_text = preprocess_text(resume_text)
-        skills = extract_skills(preprocessed_text, skill_set)
+        if error:
+            print(f"Error extracting text: {error}")
+        skills = skill_matcher.find(preprocessed_text)
         extracted_skills_all.append(skills)
         print(f"Extracted Skills: {skills}")
         processed_resumes.append(preprocessed_text)
+        resume_texts[resume_path] = resume_text
+        documents[resume_path] = ResumeDocument(resume_text)
 
     # Rank resumes
-    ranked_resumes = rank_resumes(processed_resumes, preprocess_text(job_description))
+    ranked_resumes = rank_resumes_batch(processed_resumes, preprocess_text(job_description))
 
     # Identify skill gaps
     required_skills = set(skill_set)
     combined_skills = set(skill for skills in extracted_skills_all for skill in skills)
     skill_gaps = identify_skill_gaps(combined_skills, required_skills)
 
-    # Generate PDF report
-    generate_pdf_report(ranked_resumes, skill_gaps)
+    # Generate PDF report (top rows only; the full ranking goes to the CSV appendix)
+    generate_pdf_report(ranked_resumes, skill_gaps, top_n=REPORT_TOP_N,
+                        appendix_path="resume_report_appendix.csv")
 
     print("\nResume Rankings (Higher is Better):")
     for idx, (resume, score) in enumerate(ranked_resumes, 1):
@@ -299,13 +1676,13 @@ if __name__ == "__main__":
         collect_feedback(resume_id=idx, feedback_text=feedback, feedback_log=feedback_log)
 
     # Detect overqualification
-    for idx, resume_text in enumerate(resumes, 1):
+    for idx, resume_text in enumerate(documents.values(), 1):
         is_overqualified = detect_overqualification(resume_text, job_description)
         if is_overqualified:
             print(f"Resume {idx} is overqualified for the job.")
 
     # Check for career gaps
-    for idx, resume_text in enumerate(resumes, 1):
+    for idx, resume_text in enumerate(documents.values(), 1):
         career_gaps = detect_career_gaps(resume_text)
         if career_gaps:
             print(f"Resume {idx} has career gaps: {career_gaps}")
@@ -327,7 +1704,7 @@ if __name__ == "__main__":
             print(f"Resume {idx} has no red flags.")
     
     # Check resume formatting
-    for idx, resume_text in enumerate(resumes, 1):
+    for idx, resume_text in enumerate(documents.values(), 1):
         formatting_issues = check_resume_formatting(resume_text)
         if formatting_issues:
             print(f"Resume {idx} has formatting issues: {formatting_issues}")
@@ -335,10 +1712,10 @@ if __name__ == "__main__":
             print(f"Resume {idx} has no formatting issues.")
 
     # Detect duplicates
-    duplicates = check_duplicates(resumes)
+    duplicates = check_duplicates(resume_texts.values(), keys=resume_texts.keys())
     if duplicates:
-        for duplicate in duplicates:
-            print(duplicate)
+        for first, second, similarity in duplicates:
+            print(f"{second} is a near-duplicate of {first} (similarity {similarity:.2f})")
     else:
         print("No duplicate resumes detected.")
     
@@ -0,0 +1,185 @@
+# Benchmark harness for the AK screening pipeline
+# Generates a synthetic resume / job description corpus at a chosen scale, times each
+# pipeline stage, writes machine-readable results and flags regressions against a
+# stored baseline.
+#
+#   python AKbench.py --scale 10000 --output bench.json --baseline bench_baseline.json
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+
+import AK
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Patel", "Okafor", "Novak", "Silva", "Kim", "Müller", "Haddad"]
+TITLES = ["Software Engineer", "Data Scientist", "Senior Developer", "Product Manager",
+          "DevOps Engineer", "Lead Analyst", "QA Engineer", "Machine Learning Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+SKILLS = ["Python", "Java", "JavaScript", "SQL", "Machine Learning", "Docker", "Kubernetes", "AWS",
+          "React", "Node.js", "C++", "Go", "Data Analysis", "TensorFlow", "Spark", "Linux",
+          "Project Management", "REST APIs", "Git", "Tableau"]
+FILLER = ("designed built maintained improved scalable services pipelines customers teams "
+          "delivered reduced latency increased revenue automated testing deployment "
+          "collaborated stakeholders requirements architecture migrated legacy systems").split()
+
+
+# Function to Generate one Synthetic Resume
+def _synthetic_resume(rng):
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    start = rng.randint(1995, 2015)
+    lines = [name, f"{name.split()[0].lower()}@example.com", "", "Experience"]
+    year = start
+    for _ in range(rng.randint(1, 4)):
+        end = year + rng.randint(1, 6)
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} ({year} - {end})")
+        lines.append(" ".join(rng.choices(FILLER, k=rng.randint(15, 40))))
+        year = end + rng.randint(0, 2)
+    lines += ["", "Education", f"BSc Computer Science, {start - 4}", "", "Skills",
+              ", ".join(rng.sample(SKILLS, rng.randint(3, 10)))]
+    return "\n".join(lines)
+
+
+# Function to Generate one Synthetic Job Description
+def _synthetic_job(rng):
+    skills = rng.sample(SKILLS, rng.randint(3, 6))
+    return (f"We are hiring a {rng.choice(TITLES)} at {rng.choice(COMPANIES)}. "
+            f"Required skills: {', '.join(skills)}. " + " ".join(rng.choices(FILLER, k=30)))
+
+
+# Function to Generate a Synthetic Corpus of Resumes and Job Descriptions
+def generate_corpus(n_resumes, n_jobs=200, seed=0):
+    rng = random.Random(seed)
+    resumes = [_synthetic_resume(rng) for _ in range(n_resumes)]
+    jobs = [_synthetic_job(rng) for _ in range(n_jobs)]
+    return resumes, jobs
+
+
+# Function to Write Resumes as PDFs, returning their paths
+def write_pdf_resumes(resumes, output_dir):
+    from fpdf import FPDF
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for idx, resume in enumerate(resumes):
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_font("Arial", size=11)
+        for line in resume.split("\n"):
+            pdf.multi_cell(0, 6, txt=line.encode("latin-1", "replace").decode("latin-1"))
+        path = os.path.join(output_dir, f"resume{idx}.pdf")
+        pdf.output(path)
+        paths.append(path)
+    return paths
+
+
+# Function to Time one Stage; failures are recorded instead of aborting the run
+def _time_stage(results, name, items, fn):
+    started = time.perf_counter()
+    try:
+        value = fn()
+    except Exception as e:
+        results[name] = {"error": f"{type(e).__name__}: {e}"}
+        print(f"{name}: failed ({type(e).__name__})")
+        return None
+    seconds = time.perf_counter() - started
+    results[name] = {"seconds": seconds, "items": items, "per_item_ms": 1000 * seconds / max(items, 1)}
+    print(f"{name}: {seconds:.3f}s for {items} items")
+    return value
+
+
+# Function to Run every Stage over a Corpus of the given Scale
+def run_benchmark(scale, pdf_count=200, legacy_rank_count=200, output_dir=None):
+    resumes, jobs = generate_corpus(scale)
+    job_description = jobs[0]
+    skill_set = set(SKILLS)
+    stages = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_dir = output_dir or tmp_dir
+        pdf_paths = write_pdf_resumes(resumes[:pdf_count], os.path.join(output_dir, "pdfs"))
+
+        _time_stage(stages, "extract_text", len(pdf_paths), lambda: [AK.extract_text(p) for p in pdf_paths])
+        _time_stage(stages, "extract_texts_parallel", len(pdf_paths),
+                    lambda: list(AK.extract_texts_parallel(pdf_paths)))
+        processed = _time_stage(stages, "preprocess_text", len(resumes),
+                                lambda: [AK.preprocess_text(r) for r in resumes])
+        processed = processed or [r.lower() for r in resumes]
+        skill_matcher = AK.SkillMatcher(skill_set)
+        skills = _time_stage(stages, "extract_skills", len(resumes),
+                             lambda: [skill_matcher.find(r) for r in resumes])
+        _time_stage(stages, "rank_resumes", min(legacy_rank_count, scale),
+                    lambda: AK.rank_resumes(processed[:legacy_rank_count], job_description))
+        ranked = _time_stage(stages, "rank_resumes_batch", len(processed),
+                             lambda: AK.rank_resumes_batch(processed, job_description))
+        _time_stage(stages, "recommend_candidates", len(processed),
+                    lambda: AK.recommend_candidates(processed, job_description))
+        if skills is not None:
+            _time_stage(stages, "weighted_skill_score_batch", len(skills),
+                        lambda: AK.weighted_skill_score_batch(skills, {s: 1 for s in SKILLS}))
+        if ranked is not None:
+            _time_stage(stages, "generate_summary_report", len(ranked),
+                        lambda: AK.generate_summary_report(ranked, [], os.path.join(output_dir, "summary.json")))
+            _time_stage(stages, "generate_pdf_report", len(ranked),
+                        lambda: AK.generate_pdf_report(ranked, [], os.path.join(output_dir, "report.pdf"), top_n=100,
+                                                       appendix_path=os.path.join(output_dir, "appendix.csv")))
+    return {"scale": scale, "python": platform.python_version(), "platform": platform.platform(),
+            "timestamp": time.time(), "stages": stages}
+
+
+# Function to Compare Results with a Baseline, returning regressed stages
+# A stage regresses when its per-item time is more than `tolerance` slower, or when it
+# completed in the baseline but is now missing or failing (reported with an "error").
+def find_regressions(results, baseline, tolerance=0.2):
+    regressions = []
+    for name, base in baseline.get("stages", {}).items():
+        if "per_item_ms" not in base:
+            continue
+        current = results["stages"].get(name)
+        if current is None or "per_item_ms" not in current:
+            error = current.get("error", "no timing") if current else "stage missing"
+            regressions.append({"stage": name, "baseline_ms": base["per_item_ms"], "current_ms": None,
+                                "error": error})
+            continue
+        if current["per_item_ms"] > base["per_item_ms"] * (1 + tolerance):
+            regressions.append({"stage": name, "baseline_ms": base["per_item_ms"],
+                                "current_ms": current["per_item_ms"]})
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the AK resume screening pipeline.")
+    parser.add_argument("--scale", type=int, default=1000, help="number of synthetic resumes (e.g. 1000, 10000, 100000)")
+    parser.add_argument("--pdf-count", type=int, default=200, help="number of resumes rendered to PDF")
+    parser.add_argument("--legacy-rank-count", type=int, default=200,
+                        help="resumes ranked with the per-resume rank_resumes")
+    parser.add_argument("--output", default="bench_results.json", help="where to write the results")
+    parser.add_argument("--baseline", help="baseline results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging")
+    parser.add_argument("--write-baseline", action="store_true", help="also store the results as the baseline")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.scale, args.pdf_count, args.legacy_rank_count)
+    with open(args.output, 'w') as file:
+        json.dump(results, file, indent=4)
+    print(f"Benchmark results saved to {args.output}")
+
+    if args.baseline and args.write_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=4)
+        print(f"Baseline saved to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline, 'r') as file:
+            regressions = find_regressions(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            if "error" in regression:
+                print(f"REGRESSION {regression['stage']}: {regression['baseline_ms']:.3f} ms/item "
+                      f"-> {regression['error']}")
+            else:
+                print(f"REGRESSION {regression['stage']}: {regression['baseline_ms']:.3f} ms/item "
+                      f"-> {regression['current_ms']:.3f} ms/item")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline.")
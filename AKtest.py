@@ -1,15 +1,48 @@
-
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from fpdf import FPDF
+import AK
+import AKbench
 from AK import (
     extract_text,
+    extract_texts_parallel,
+    read_document,
     preprocess_text,
+    preprocess_batch,
+    ResumeTextCache,
+    load_resume_cached,
+    load_resumes_cached,
     extract_skills,
+    SkillMatcher,
     rank_resumes,
+    rank_resumes_batch,
+    match_resumes_to_jobs,
+    recommend_candidates,
+    CandidateIndex,
+    check_duplicates,
+    MinHashLSH,
     generate_pdf_report,
+    summarize_texts,
+    extract_entities_batch,
     load_skill_set,
     identify_skill_gaps,
+    identify_skill_gaps_batch,
+    weighted_skill_score,
+    weighted_skill_score_batch,
     collect_feedback,
+    JobDescriptionFetcher,
+    FeedbackStore,
     detect_overqualification,
     check_resume_formatting,
+    parse_resume_sections,
+    detect_career_gaps,
+    ResumeDocument,
     generate_summary_report,
 )
 
@@ -20,18 +53,174 @@ test_skill_file_path = "test_skills.txt"  # Replace with actual path
 test_feedback_log = "test_feedback_log.txt"
 
 # Sample test cases
+def test_import_is_lazy():
+    probe = ("import sys, AK; heavy = ['nltk', 'sklearn', 'spacy', 'transformers', 'PyPDF2'];"
+             "print([name for name in heavy if name in sys.modules], AK.IMPORT_SECONDS)")
+    env = dict(os.environ, AK_OFFLINE="1")
+    output = subprocess.run([sys.executable, "-c", probe], cwd=os.path.dirname(os.path.abspath(__file__)),
+                            env=env, capture_output=True, text=True, check=True).stdout
+    assert output.startswith("[]"), f"Heavy modules loaded at import time: {output}"
+    print(f"Lazy import test passed ({output.split()[-1]}s).")
+
+def test_ensure_nltk_data():
+    import nltk
+    missing, downloaded = [], []
+    def find(resource, *args, **kwargs):
+        missing.append(resource)
+        raise LookupError(resource)
+    find_resource, download = nltk.data.find, nltk.download
+    ready, offline = AK._nltk_ready, AK.OFFLINE_MODE
+    nltk.data.find, nltk.download = find, downloaded.append
+    AK._nltk_ready, AK.OFFLINE_MODE = False, False
+    try:
+        AK.ensure_nltk_data()
+    finally:
+        nltk.data.find, nltk.download = find_resource, download
+        AK._nltk_ready, AK.OFFLINE_MODE = ready, offline
+    assert "punkt_tab" in downloaded and "tokenizers/punkt_tab/english/" in missing, \
+        f"punkt_tab not checked or downloaded: {downloaded}"
+    print("NLTK data test passed.")
+
 def test_extract_text():
     for resume in test_resumes:
         text = extract_text(resume)
         assert text, f"Failed to extract text from {resume}"
     print("Extract text test passed.")
 
+def test_extract_texts_parallel():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for idx in range(3):
+            pdf = FPDF()
+            pdf.add_page()
+            pdf.set_font("Arial", size=12)
+            pdf.cell(0, 10, txt=f"Resume number {idx}", ln=True)
+            path = os.path.join(tmp_dir, f"resume{idx}.pdf")
+            pdf.output(path)
+            paths.append(path)
+        missing = os.path.join(tmp_dir, "missing.pdf")
+        results = {path: (text, error) for path, text, error in
+                   extract_texts_parallel(paths + [missing], max_workers=2, max_in_flight=2)}
+    assert len(results) == 4, "Parallel extraction dropped files"
+    for idx, path in enumerate(paths):
+        text, error = results[path]
+        assert error is None and f"Resume number {idx}" in text, f"Failed to extract text from {path}"
+    assert results[missing][1], "Missing file should report an error"
+    print("Extract texts parallel test passed.")
+
+def test_read_document():
+    import docx
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        pdf = FPDF()
+        pdf.set_font("Arial", size=12)
+        for page in range(1, 4):
+            pdf.add_page()
+            pdf.cell(0, 10, txt=f"Portfolio page {page}", ln=True)
+        pdf_path = os.path.join(tmp_dir, "portfolio.pdf")
+        pdf.output(pdf_path)
+        import PyPDF2
+        parsed = []
+        extract_page = PyPDF2.PageObject.extract_text
+        PyPDF2.PageObject.extract_text = lambda page, *args, **kwargs: parsed.append(1) or extract_page(page, *args, **kwargs)
+        try:
+            text, pages = read_document(pdf_path, max_pages=2)
+            assert pages == 2 and "page 2" in text and "page 3" not in text, "Page budget failed"
+            assert len(parsed) == 2, f"Parsed {len(parsed)} pages for a budget of 2"
+            assert read_document(pdf_path, max_pages=0) == ("", 0) and len(parsed) == 2, "Empty budget parsed pages"
+        finally:
+            PyPDF2.PageObject.extract_text = extract_page
+
+        document = docx.Document()
+        for line in ["Jane Doe", "Experience", "Python developer"]:
+            document.add_paragraph(line)
+        docx_path = os.path.join(tmp_dir, "resume.docx")
+        document.save(docx_path)
+        assert extract_text(docx_path) == "Jane Doe\nExperience\nPython developer", "DOCX extraction failed"
+        os.rename(docx_path, os.path.join(tmp_dir, "resume_upload"))
+        text, paragraphs = read_document(os.path.join(tmp_dir, "resume_upload"), max_chars=12)
+        assert text == "Jane Doe\nExp" and paragraphs == 2, "Character budget or format sniffing failed"
+    print("Read document test passed.")
+
 def test_preprocess_text():
     sample_text = "This is a test! With punctuation and stopwords."
     processed = preprocess_text(sample_text)
     assert "test" in processed and "punctuation" in processed, "Preprocessing failed"
     print("Preprocess text test passed.")
 
+def test_preprocess_batch():
+    samples = ["This is a test!  With punctuation.", "Another   résumé, with Python & SQL."]
+    expected = [preprocess_text(sample) for sample in samples]
+    assert preprocess_batch(samples) == expected, "Batch preprocessing differs"
+    assert preprocess_batch(iter(samples), n_jobs=2) == expected, "Parallel preprocessing differs"
+    print("Preprocess batch test passed.")
+
+def test_resume_text_cache():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = ResumeTextCache(os.path.join(tmp_dir, "cache"), max_bytes=150)
+        entry = {"text": "Python", "preprocessed": "python", "tokens": ["python"]}
+        assert cache.get("a") is None, "Empty cache should miss"
+        cache.put("a", entry)
+        assert cache.get("a") == entry, "Cached entry not returned"
+        cache.put("b", entry)
+        cache.get("a")
+        cache.put("c", entry)  # Over budget: evicts "b", the least recently used
+        assert cache.get("b") is None and cache.get("a") == entry, "LRU eviction failed"
+        assert ResumeTextCache(cache.cache_dir).get("c") == entry, "Cache did not persist"
+        assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 2, "Hit/miss counters wrong"
+
+        broken_path = os.path.join(tmp_dir, "broken.pdf")
+        with open(broken_path, "wb") as file:
+            file.write(b"%PDF-1.4 truncated")
+        failures = ResumeTextCache(os.path.join(tmp_dir, "failures"))
+        assert load_resume_cached(broken_path, failures) == ("", "", []), "Failed extraction returned text"
+        assert failures.stats()["entries"] == 0, "Failed extraction was cached"
+        key = failures.key_for_file(broken_path)
+        AK.EXTRACT_VERSION += 1
+        try:
+            assert failures.key_for_file(broken_path) != key, "Extractor version not part of the cache key"
+        finally:
+            AK.EXTRACT_VERSION -= 1
+    print("Resume text cache test passed.")
+
+def test_load_resumes_cached():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for idx in range(2):
+            pdf = FPDF()
+            pdf.add_page()
+            pdf.set_font("Arial", size=12)
+            pdf.cell(0, 10, txt=f"Python developer {idx}", ln=True)
+            path = os.path.join(tmp_dir, f"resume{idx}.pdf")
+            pdf.output(path)
+            paths.append(path)
+        broken_path = os.path.join(tmp_dir, "broken.pdf")
+        with open(broken_path, "wb") as file:
+            file.write(b"%PDF-1.4 truncated")
+        missing = os.path.join(tmp_dir, "missing.pdf")
+        cache = ResumeTextCache(os.path.join(tmp_dir, "cache"))
+        first = {result[0]: result[1:] for result in
+                 load_resumes_cached(paths + [broken_path, missing], cache, max_workers=2)}
+        assert len(first) == 4, "Cached loading dropped files"
+        for path in paths:
+            text, preprocessed, tokens, error = first[path]
+            assert error is None and "python" in tokens and preprocessed == " ".join(tokens), "Resume not loaded"
+        assert first[broken_path][3] and first[missing][3], "Unreadable files should report an error"
+        assert cache.stats()["entries"] == 2, "Only successful extractions should be cached"
+
+        submitted = []
+        bounded_pool = AK._bounded_pool
+        def recording_pool(worker, file_paths, *args):
+            submitted.extend(file_paths)
+            return bounded_pool(worker, file_paths, *args)
+        AK._bounded_pool = recording_pool
+        try:
+            second = {result[0]: result[1:] for result in load_resumes_cached(paths + [broken_path], cache)}
+        finally:
+            AK._bounded_pool = bounded_pool
+        assert submitted == [broken_path], "Cached resumes were extracted again"
+        assert all(second[path] == first[path] for path in paths), "Cached resume differs from extraction"
+    print("Load resumes cached test passed.")
+
 def test_extract_skills():
     sample_text = "I am skilled in Python, Machine Learning, and SQL."
     skill_set = {"Python", "Machine Learning", "SQL", "Java"}
@@ -39,6 +228,19 @@ def test_extract_skills():
     assert set(extracted) == {"Python", "Machine Learning", "SQL"}, "Skill extraction failed"
     print("Extract skills test passed.")
 
+def test_skill_matcher():
+    matcher = SkillMatcher({"Java", "JavaScript", "C++", "Machine Learning", "Node.js", "SQL"})
+    extracted = matcher.find("Built Node.js services in JavaScript and C++; machine learning with SQL.")
+    assert set(extracted) == {"Node.js", "JavaScript", "C++", "Machine Learning", "SQL"}, "Skill matching failed"
+    batch = matcher.find_batch(["Java developer", "Machine shop, learning fast"])
+    assert batch == [["Java"], []], "Batch skill matching failed"
+    taxonomy = {"Python", "SQL"}
+    assert AK._get_skill_matcher(taxonomy) is AK._get_skill_matcher(taxonomy), "Matcher rebuilt for the same set"
+    taxonomy.add("Go")
+    assert extract_skills("Python and Go", taxonomy) == ["Python", "Go"], "Matcher not rebuilt after the set grew"
+    assert extract_skills("SQL only", matcher) == ["SQL"], "Prebuilt matcher not accepted"
+    print("Skill matcher test passed.")
+
 def test_rank_resumes():
     sample_resumes = ["I have experience in Python.", "Skilled in Java."]
     job_description = "Looking for a Python developer."
@@ -46,6 +248,118 @@ def test_rank_resumes():
     assert ranked[0][1] > ranked[1][1], "Ranking logic failed"
     print("Rank resumes test passed.")
 
+def test_rank_resumes_batch():
+    sample_resumes = ["Skilled in Java.", "I have experience in Python.", "Python and Django developer."]
+    job_description = "Looking for a Python developer."
+    ranked = rank_resumes_batch(sample_resumes, job_description)
+    assert len(ranked) == 3 and ranked[-1][0] == "Skilled in Java.", "Batch ranking logic failed"
+    top = rank_resumes_batch(sample_resumes, job_description, top_k=1)
+    assert top == ranked[:1], "Top-k selection failed"
+    print("Rank resumes batch test passed.")
+
+class _WordTokenizer:
+    model_max_length = 20
+
+    def encode(self, text, add_special_tokens=False):
+        return text.split()
+
+    def decode(self, token_ids, skip_special_tokens=True):
+        return " ".join(token_ids)
+
+
+class _FirstWordSummarizer:
+    tokenizer = _WordTokenizer()
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, chunks, **kwargs):
+        self.calls += 1
+        return [{"summary_text": chunk.split()[0]} for chunk in chunks]
+
+
+def test_summarize_texts():
+    fake = _FirstWordSummarizer()
+    original, AK._summarizer = AK._summarizer, fake
+    try:
+        long_text = " ".join(["alpha"] * 4 + ["beta"] * 4)  # Split into two chunks of 4 tokens
+        summaries = summarize_texts(["short resume text", long_text, "short resume text"])
+        assert summaries == ["short", "alpha beta", "short"], "Batched summarization failed"
+        assert summarize_texts([long_text]) == ["alpha beta"] and fake.calls == 1, "Summary cache missed"
+    finally:
+        AK._summarizer = original
+    print("Summarize texts test passed.")
+
+def test_extract_entities_batch():
+    import spacy
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "ORG", "pattern": "Acme"},
+        {"label": "GPE", "pattern": "Berlin"},
+    ])
+    original, AK._nlp = AK._nlp, nlp
+    try:
+        texts = ["Worked at Acme in Berlin.", "No entities here.", "Acme again."]
+        entities = list(extract_entities_batch(texts, batch_size=2))
+    finally:
+        AK._nlp = original
+    assert entities == [{"ORG": ["Acme"], "GPE": ["Berlin"]}, {}, {"ORG": ["Acme"]}], "Batch NER failed"
+    print("Extract entities batch test passed.")
+
+def test_match_resumes_to_jobs():
+    resumes = ["Python developer", "Java engineer", "Python and Java", "Chef"]
+    jobs = ["Python role", "Java role"]
+    matches = match_resumes_to_jobs(resumes, jobs, top_k=2, block_size=3)
+    assert [i for i, _ in matches["top_candidates_per_job"][0]] == [0, 2], "Top candidates per job failed"
+    assert [i for i, _ in matches["top_candidates_per_job"][1]] == [1, 2], "Top candidates per job failed"
+    assert matches["top_jobs_per_candidate"][1][0][0] == 1, "Top jobs per candidate failed"
+    assert len(matches["top_jobs_per_candidate"]) == 4, "Missing candidates in result"
+    print("Match resumes to jobs test passed.")
+
+def test_candidate_index():
+    candidates = ["Python developer with Django", "Java engineer", "Data scientist using Python"]
+    job_description = "Python developer"
+    index = CandidateIndex.build(candidates, candidate_ids=["a", "b", "c"])
+    expected = [(["a", "b", "c"][i], score) for i, score in recommend_candidates(candidates, job_description)]
+    ranked = index.query(job_description, top_k=3)
+    assert [cid for cid, _ in ranked] == [cid for cid, _ in expected], "Index ranking differs from refit"
+    index.add(["Senior Python developer"], ["d"])
+    index.remove(["a"])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index.save(tmp_dir)
+        reloaded = CandidateIndex.load(tmp_dir)
+        ranked = reloaded.query(job_description, top_k=2)
+        assert len(reloaded) == 3 and ranked[0][0] == "d" and "a" not in dict(ranked), "Index update failed"
+        # Saving from another instance must not disturb a reader that memory-mapped the old files
+        indptr = list(reloaded._matrix.indptr)
+        writer = CandidateIndex.load(tmp_dir, mmap=False)
+        writer.add(["Python developer and Django expert"] * 50, [f"new{i}" for i in range(50)])
+        writer.save(tmp_dir)
+        assert list(reloaded._matrix.indptr) == indptr and reloaded.query(job_description, top_k=2) == ranked, \
+            "Reader saw a concurrent save"
+        assert len(CandidateIndex.load(tmp_dir)) == 53, "New generation not loaded"
+        assert len([name for name in os.listdir(tmp_dir) if name.startswith("gen-")]) == 1, \
+            "Old generations not retired"
+        del reloaded
+    print("Candidate index test passed.")
+
+def test_check_duplicates():
+    base = " ".join(f"word{i}" for i in range(200))
+    clone = base.replace("word150", "changed")
+    other = " ".join(f"term{i}" for i in range(200))
+    duplicates = check_duplicates([base, other, clone], threshold=0.8)
+    assert [(a, b) for a, b, _ in duplicates] == [(0, 2)], "Near-duplicate detection failed"
+    assert check_duplicates(["", "", "  ...  ", base]) == [], "Empty texts reported as duplicates"
+    assert len(MinHashLSH()) == 0 and MinHashLSH().query("") == [], "Empty text matched"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "signatures.npz")
+        lsh = MinHashLSH(threshold=0.8)
+        check_duplicates([base, other], lsh=lsh)
+        lsh.save(path)
+        new_arrivals = check_duplicates([clone], keys=["new"], lsh=MinHashLSH.load(path))
+    assert [(a, b) for a, b, _ in new_arrivals] == [(0, "new")], "Incremental duplicate check failed"
+    print("Check duplicates test passed.")
+
 def test_generate_pdf_report():
     ranked_resumes = [("Resume 1", 0.8), ("Resume 2", 0.6)]
     skill_gaps = ["Data Analysis", "Machine Learning"]
@@ -64,10 +378,144 @@ def test_identify_skill_gaps():
     assert gaps == ["Data Analysis"], "Skill gap identification failed"
     print("Identify skill gaps test passed.")
 
+def test_weighted_skill_score_batch():
+    candidates = [["python", "SQL"], [], ["Java", "Python"], ["Go"]]
+    weights = {"Python": 3, "SQL": 1, "Java": 2}
+    scores = weighted_skill_score_batch(candidates, weights)
+    expected = [weighted_skill_score(skills, weights) for skills in candidates]
+    assert [round(score, 6) for score in scores] == [round(score, 6) for score in expected], "Batch scoring failed"
+    gaps = identify_skill_gaps_batch(candidates, {"Python", "SQL"})
+    assert gaps == [sorted(identify_skill_gaps(set(skills), {"Python", "SQL"})) for skills in candidates], \
+        "Batch skill gaps failed"
+    print("Weighted skill score batch test passed.")
+
 def test_collect_feedback():
     collect_feedback(1, "Good candidate", test_feedback_log)
+    with open(test_feedback_log) as log:
+        assert "Good candidate" in log.read().splitlines()[-1], "Feedback not written through"
     print("Feedback collection test passed.")
 
+def test_feedback_store():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "feedback.txt")
+        with open(path, "w") as log:
+            log.write("Resume ID: 7, Feedback: Legacy entry\n")
+        with FeedbackStore(path, flush_every=10) as store:
+            for idx in range(25):
+                store.add(idx % 5, f"note {idx}")
+            records = store.get(3)
+            assert [record["feedback"] for record in records] == ["note 3", "note 8", "note 13", "note 18", "note 23"], \
+                "Feedback lookup failed"
+            assert store.get("7")[0]["feedback"] == "Legacy entry", "Legacy feedback not indexed"
+        other_worker = FeedbackStore(path)
+        other_worker.add(3, "from another worker")
+        other_worker.close()
+        reopened = FeedbackStore(path)
+        assert len(reopened.get(3)) == 6 and sorted(reopened.resume_ids()) == ["0", "1", "2", "3", "4", "7"], \
+            "Feedback index rebuild failed"
+        idle_worker = FeedbackStore(path, flush_every=100, flush_interval=0.05)
+        idle_worker.add(9, "last entry before going idle")
+        deadline = time.monotonic() + 5
+        while "last entry before going idle" not in open(path).read() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert FeedbackStore(path).get(9)[0]["feedback"] == "last entry before going idle", "Idle buffer not flushed"
+        idle_worker.close()
+    print("Feedback store test passed.")
+
+class _StubJobsHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+    failures_left = {"2": 1}
+
+    def do_GET(self):
+        job_id = self.path.rsplit("/", 1)[-1]
+        self.requests_seen.append((job_id, self.headers.get("If-None-Match"), self.headers.get("Authorization")))
+        if self.failures_left.get(job_id):
+            self.failures_left[job_id] -= 1
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        etag = f'"v{job_id}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({"job_description": f"Job {job_id}"}).encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def test_job_description_fetcher():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubJobsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    api_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            fetcher = JobDescriptionFetcher(api_url, "key", cache_dir=tmp_dir, max_workers=4, backoff=0.01)
+            jobs = fetcher.fetch_many(["1", "2", "3"])
+            assert jobs == {"1": "Job 1", "2": "Job 2", "3": "Job 3"}, "Concurrent fetch failed"
+            assert sum(1 for job_id, _, _ in _StubJobsHandler.requests_seen if job_id == "2") == 2, "No retry on 503"
+            _StubJobsHandler.requests_seen.clear()
+            assert fetcher.fetch("1") == "Job 1", "Revalidated fetch failed"
+            assert _StubJobsHandler.requests_seen == [("1", '"v1"', "Bearer key")], "ETag not sent"
+            fetcher.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    print("Job description fetcher test passed.")
+
+def test_pipeline_metrics():
+    metrics = AK.enable_metrics()
+    metrics.reset()
+    try:
+        extract_skills("Python and SQL developer", {"Python", "SQL", "Java"})
+        extract_text("missing_resume.pdf")
+        with AK.SamplingProfiler(interval=0.001) as profiler:
+            rank_resumes_batch(["Python developer"] * 200, "Python")
+            time.sleep(0.05)  # Give the sampler a few ticks even on fast machines
+            assert profiler.top(), "Profiler not readable while running"
+        snapshot = metrics.snapshot()
+        assert snapshot["counters"]["skills_matched"] == 2, "Skill counter failed"
+        assert snapshot["counters"]["errors"] == 1 and snapshot["counters"]["documents"] == 1, "Error counter failed"
+        assert snapshot["stages"]["extract_skills"]["calls"] == 1, "Stage timer failed"
+        assert snapshot["stages"]["extract_text"]["errors"] == 1, "Serial extraction error not recorded"
+        assert profiler.samples, "Sampling profiler collected nothing"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            prom_path = os.path.join(tmp_dir, "metrics.prom")
+            metrics.export_prometheus(prom_path)
+            with open(prom_path) as file:
+                assert 'ak_stage_calls_total{stage="rank_resumes"} 1' in file.read(), "Prometheus export failed"
+    finally:
+        AK.enable_metrics(False)
+        metrics.reset()
+    extract_skills("Python", {"Python"})
+    assert metrics.snapshot()["counters"] == {}, "Disabled metrics still recorded"
+    print("Pipeline metrics test passed.")
+
+def test_benchmark_harness():
+    resumes, jobs = AKbench.generate_corpus(50, n_jobs=5, seed=1)
+    assert len(resumes) == 50 and len(jobs) == 5, "Corpus generation failed"
+    assert AKbench.generate_corpus(50, n_jobs=5, seed=1) == (resumes, jobs), "Corpus is not reproducible"
+    results = AKbench.run_benchmark(30, pdf_count=3, legacy_rank_count=5)
+    assert results["stages"]["rank_resumes_batch"]["items"] == 30, "Stage timing missing"
+    slower = {"stages": {name: dict(stage, per_item_ms=stage["per_item_ms"] * 10)
+                         for name, stage in results["stages"].items() if "per_item_ms" in stage}}
+    assert AKbench.find_regressions(results, results) == [], "False regression flagged"
+    assert AKbench.find_regressions(slower, results), "Regression not flagged"
+    baseline = {"stages": {"extract_text": {"per_item_ms": 1.0}, "preprocess_text": {"per_item_ms": 1.0},
+                           "extract_skills": {"error": "LookupError: "}}}
+    broken = {"stages": {"extract_text": {"error": "ImportError: PyPDF2"},
+                         "extract_skills": {"error": "LookupError: "}}}
+    assert [(r["stage"], r["error"]) for r in AKbench.find_regressions(broken, baseline)] == [
+        ("extract_text", "ImportError: PyPDF2"), ("preprocess_text", "stage missing")], \
+        "Failing or missing stages not flagged"
+    print("Benchmark harness test passed.")
+
 def test_detect_overqualification():
     resume_text = "Senior Developer with advanced skills."
     job_description = "Looking for an entry-level developer."
@@ -81,23 +529,89 @@ def test_check_resume_formatting():
     assert "No formatting issues detected." in issues, "Formatting check failed"
     print("Check resume formatting test passed.")
 
+def test_resume_document():
+    text = "Jane Doe\nEducation\nBSc 2008\nExperience\nSenior Engineer 2012 - 2020\nSkills\nPython"
+    document = ResumeDocument(text)
+    assert parse_resume_sections(document) == parse_resume_sections(text), "Wrapper results differ"
+    assert document.sections["Experience"] == ["Senior Engineer 2012 - 2020"], "Section parsing failed"
+    assert document.years == [2008, 2012, 2020], "Year extraction failed"
+    assert detect_career_gaps(document, min_gap=5) == [(2012, 2020)], "Career gap detection failed"
+    assert detect_overqualification(document, "Junior role"), "Overqualification on document failed"
+    assert extract_skills(document, {"Python", "Java"}) == ["Python"], "Skills on document failed"
+    print("Resume document test passed.")
+
 def test_generate_summary_report():
     ranked_resumes = [("Resume 1", 0.8), ("Resume 2", 0.6)]
     skill_gaps = ["Data Analysis", "Machine Learning"]
     generate_summary_report(ranked_resumes, skill_gaps, "test_summary_report.json")
     print("Summary report generation test passed.")
 
+def test_streaming_reports():
+    def rankings():
+        for idx in range(250):
+            yield f"Resume {idx}", 1.0 - idx / 1000
+    skill_gaps = ["Data Analysis"]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, "report.json")
+        generate_summary_report(rankings(), skill_gaps, json_path)
+        with open(json_path) as file:
+            report = json.load(file)
+        assert len(report["ranked_resumes"]) == 250 and report["skill_gaps"] == skill_gaps, "Streamed JSON failed"
+
+        jsonl_path = os.path.join(tmp_dir, "report.jsonl")
+        generate_summary_report(rankings(), skill_gaps, jsonl_path, json_lines=True)
+        with open(jsonl_path) as file:
+            lines = [json.loads(line) for line in file]
+        assert lines[0] == {"skill_gaps": skill_gaps} and lines[-1]["rank"] == 250, "JSON Lines report failed"
+
+        appendix_path = os.path.join(tmp_dir, "appendix.csv")
+        generate_pdf_report(rankings(), skill_gaps, os.path.join(tmp_dir, "report.pdf"),
+                            top_n=100, appendix_path=appendix_path, rows_per_page=40)
+        with open(appendix_path) as file:
+            appendix = file.read().splitlines()
+        assert len(appendix) == 151 and appendix[1].startswith("101,"), "PDF appendix failed"
+        generate_pdf_report(rankings(), skill_gaps, os.path.join(tmp_dir, "empty.pdf"),
+                            top_n=0, appendix_path=appendix_path)
+        with open(appendix_path) as file:
+            appendix = file.read().splitlines()
+        assert len(appendix) == 251 and appendix[1].startswith("1,"), "top_n=0 still rendered rows"
+        generate_pdf_report(rankings(), skill_gaps, os.path.join(tmp_dir, "default.pdf"), appendix_path=appendix_path)
+        with open(appendix_path) as file:
+            appendix = file.read().splitlines()
+        assert appendix[1].startswith(f"{AK.REPORT_TOP_N + 1},"), "Default report is not bounded"
+    print("Streaming reports test passed.")
+
 if __name__ == "__main__":
     print("Running tests...")
+    test_import_is_lazy()
     test_extract_text()
+    test_extract_texts_parallel()
+    test_read_document()
     test_preprocess_text()
+    test_preprocess_batch()
+    test_resume_text_cache()
+    test_load_resumes_cached()
     test_extract_skills()
+    test_skill_matcher()
     test_rank_resumes()
+    test_rank_resumes_batch()
+    test_summarize_texts()
+    test_extract_entities_batch()
+    test_match_resumes_to_jobs()
+    test_candidate_index()
+    test_check_duplicates()
     test_generate_pdf_report()
     test_load_skill_set()
     test_identify_skill_gaps()
+    test_weighted_skill_score_batch()
     test_collect_feedback()
+    test_feedback_store()
+    test_job_description_fetcher()
+    test_pipeline_metrics()
+    test_benchmark_harness()
     test_detect_overqualification()
     test_check_resume_formatting()
+    test_resume_document()
     test_generate_summary_report()
+    test_streaming_reports()
     print("All tests passed.")
@@ -1,70 +1,319 @@
+import argparse
 import bcrypt
+import csv
+import heapq
+import json
+import os
+import re
 import sqlite3
+import threading
 import time
-from datetime import datetime, timedelta
+import weakref
+from datetime import date, datetime, timedelta
 from datetime import datetime
 
+# Holds one thread's connection in thread-local storage; when the thread exits the holder is
+# dropped and a finalizer closes the connection
+class _ThreadConnection:
+    def __init__(self, conn):
+        self.conn = conn
+
+
+# Shared SQLite connection manager: owns the database path and hands every thread its
+# own long-lived connection, opened in WAL mode with tuned pragmas
+class ConnectionManager:
+    def __init__(self, db_path="health_system.db", busy_timeout=5.0, cached_statements=256,
+                 mmap_size=256 * 1024 * 1024, cache_size_kib=64 * 1024):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.cached_statements = cached_statements
+        self.mmap_size = mmap_size
+        self.cache_size_kib = cache_size_kib
+        self._local = threading.local()
+        self._connections = set()
+        # Reentrant: a finalizer may run during garbage collection while the lock is held
+        self._lock = threading.RLock()
+
+    def connection(self):
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout,
+                                   cached_statements=self.cached_statements, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            conn.execute(f"PRAGMA cache_size=-{int(self.cache_size_kib)}")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            holder = self._local.holder = _ThreadConnection(conn)
+            weakref.finalize(holder, self._release, conn)
+            with self._lock:
+                self._connections.add(conn)
+        return holder.conn
+
+    def _release(self, conn):
+        with self._lock:
+            self._connections.discard(conn)
+        conn.close()
+
+    # Number of connections currently open (one per live thread that has used the database)
+    def open_connections(self):
+        with self._lock:
+            return len(self._connections)
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = set()
+        self._local = threading.local()
+
+
+# Database location (override with HS_DB_PATH or configure_database)
+DB_PATH = os.environ.get("HS_DB_PATH", "health_system.db")
+db = ConnectionManager(DB_PATH)
+
+def configure_database(db_path, **options):
+    global db, DB_PATH
+    db.close_all()
+    DB_PATH = db_path
+    db = ConnectionManager(db_path, **options)
+    return db
+
+def get_connection():
+    return db.connection()
+
+# Schema migrations: (version, statements), applied in order inside one transaction each
+# and tracked with PRAGMA user_version. Never edit a shipped migration; append a new one.
+MIGRATIONS = [
+    (1, [
+        # Users table for authentication
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            role TEXT NOT NULL
+        )
+        """,
+        # Patients table
+        """
+        CREATE TABLE IF NOT EXISTS patients (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            age INTEGER NOT NULL,
+            gender TEXT NOT NULL,
+            contact TEXT NOT NULL
+        )
+        """,
+        # Doctors table
+        """
+        CREATE TABLE IF NOT EXISTS doctors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            specialty TEXT NOT NULL,
+            availability TEXT NOT NULL
+        )
+        """,
+        # Invoices table
+        """
+        CREATE TABLE IF NOT EXISTS invoices (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            patient_id INTEGER NOT NULL,
+            amount REAL NOT NULL,
+            status TEXT NOT NULL,
+            date TEXT NOT NULL,
+            FOREIGN KEY(patient_id) REFERENCES patients(id)
+        )
+        """,
+        # Prescriptions table
+        """
+        CREATE TABLE IF NOT EXISTS prescriptions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            patient_id INTEGER NOT NULL,
+            doctor TEXT NOT NULL,
+            prescription TEXT NOT NULL,
+            date TEXT NOT NULL,
+            FOREIGN KEY(patient_id) REFERENCES patients(id)
+        )
+        """,
+        # Reminders table (reminder_time is stored as "YYYY-MM-DD HH:MM:SS" so it sorts as text)
+        """
+        CREATE TABLE IF NOT EXISTS reminders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            patient_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            reminder_time TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'Pending',
+            FOREIGN KEY(patient_id) REFERENCES patients(id)
+        )
+        """,
+    ]),
+    (2, [
+        "CREATE INDEX IF NOT EXISTS idx_reminders_status_time ON reminders(status, reminder_time)",
+        "CREATE INDEX IF NOT EXISTS idx_reminders_patient ON reminders(patient_id)",
+        "CREATE INDEX IF NOT EXISTS idx_invoices_patient ON invoices(patient_id)",
+        "CREATE INDEX IF NOT EXISTS idx_prescriptions_patient ON prescriptions(patient_id, date)",
+    ]),
+    (3, [
+        # Full-text index over patient name and contact, kept in sync by triggers
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS patients_fts USING fts5(
+            name, contact,
+            content='patients', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS patients_fts_insert AFTER INSERT ON patients BEGIN
+            INSERT INTO patients_fts(rowid, name, contact) VALUES (new.id, new.name, new.contact);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS patients_fts_delete AFTER DELETE ON patients BEGIN
+            INSERT INTO patients_fts(patients_fts, rowid, name, contact)
+            VALUES ('delete', old.id, old.name, old.contact);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS patients_fts_update AFTER UPDATE OF name, contact ON patients BEGIN
+            INSERT INTO patients_fts(patients_fts, rowid, name, contact)
+            VALUES ('delete', old.id, old.name, old.contact);
+            INSERT INTO patients_fts(rowid, name, contact) VALUES (new.id, new.name, new.contact);
+        END
+        """,
+        # Backfill rows that existed before the index
+        "INSERT INTO patients_fts(patients_fts) VALUES ('rebuild')",
+    ]),
+    (4, [
+        # Keyset pagination: every index ends in the sort key, and the rowid breaks ties
+        "CREATE INDEX IF NOT EXISTS idx_invoices_date ON invoices(date)",
+        "CREATE INDEX IF NOT EXISTS idx_invoices_status_date ON invoices(status, date)",
+        "DROP INDEX IF EXISTS idx_invoices_patient",
+        "CREATE INDEX IF NOT EXISTS idx_invoices_patient_date ON invoices(patient_id, date)",
+        "CREATE INDEX IF NOT EXISTS idx_doctors_name ON doctors(name)",
+        "CREATE INDEX IF NOT EXISTS idx_doctors_specialty_name ON doctors(specialty, name)",
+        "CREATE INDEX IF NOT EXISTS idx_reminders_time ON reminders(reminder_time)",
+        "DROP INDEX IF EXISTS idx_reminders_patient",
+        "CREATE INDEX IF NOT EXISTS idx_reminders_patient_time ON reminders(patient_id, reminder_time)",
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# Hot queries, kept in one place so the tests can check their query plans
+PATIENT_PRESCRIPTIONS_QUERY = """
+SELECT doctor, prescription, date FROM prescriptions WHERE patient_id = ?
+"""
+
+DUE_REMINDERS_QUERY = """
+SELECT r.id, p.name, r.title, r.reminder_time
+FROM reminders r
+JOIN patients p ON r.patient_id = p.id
+WHERE r.status = 'Pending'
+AND r.reminder_time BETWEEN ? AND ?
+"""
+
+PATIENT_BY_ID_QUERY = """
+SELECT id, name, age, gender, contact FROM patients WHERE id = ?
+"""
+
+PATIENT_SEARCH_QUERY = """
+SELECT p.id, p.name, p.age, p.gender, p.contact
+FROM patients_fts
+JOIN patients p ON p.id = patients_fts.rowid
+WHERE patients_fts MATCH ?
+ORDER BY bm25(patients_fts)
+LIMIT ?
+"""
+
+# Reminder times are stored in this format so they sort and compare correctly as text
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Keyset scan of pending reminders in (reminder_time, id) order, served by idx_reminders_status_time
+PENDING_REMINDERS_QUERY = """
+SELECT reminder_time, id FROM reminders
+WHERE status = 'Pending'
+AND (reminder_time, id) > (?, ?)
+ORDER BY reminder_time, id
+LIMIT ?
+"""
+
+# Batch statements take the reminder IDs as one JSON array parameter. The unary + keeps the
+# planner from choosing the status index over direct rowid lookups. A batch is claimed by
+# moving it from 'Pending' to 'Notifying', delivered with no transaction open, then marked
+# 'Notified' (or released back to 'Pending' if delivery fails).
+CLAIM_REMINDERS_QUERY = """
+UPDATE reminders SET status = 'Notifying'
+WHERE +status = 'Pending'
+AND id IN (SELECT value FROM json_each(?))
+RETURNING id
+"""
+
+CLAIMED_REMINDERS_QUERY = """
+SELECT r.id, p.name, r.title, r.reminder_time
+FROM reminders r
+JOIN patients p ON r.patient_id = p.id
+WHERE r.id IN (SELECT value FROM json_each(?))
+ORDER BY r.reminder_time, r.id
+"""
+
+MARK_NOTIFIED_QUERY = """
+UPDATE reminders SET status = 'Notified'
+WHERE +status = 'Notifying'
+AND id IN (SELECT value FROM json_each(?))
+"""
+
+RELEASE_CLAIMED_QUERY = """
+UPDATE reminders SET status = 'Pending'
+WHERE +status = 'Notifying'
+AND id IN (SELECT value FROM json_each(?))
+"""
+
+# Claims left behind by a dispatcher that died mid-delivery
+RELEASE_STALE_CLAIMS_QUERY = """
+UPDATE reminders SET status = 'Pending' WHERE status = 'Notifying'
+"""
+
+# Paginated listings: base query, sort column and the row position of the sort value
+INVOICES_PAGE_QUERY = """
+SELECT i.id, p.name, i.amount, i.status, i.date
+FROM invoices i
+JOIN patients p ON i.patient_id = p.id
+"""
+
+DOCTORS_PAGE_QUERY = """
+SELECT id, name, specialty, availability FROM doctors
+"""
+
+REMINDERS_PAGE_QUERY = """
+SELECT r.id, p.name, r.title, r.reminder_time, r.status
+FROM reminders r
+JOIN patients p ON r.patient_id = p.id
+"""
+
+# Apply pending migrations, returning the resulting schema version
+def run_migrations(conn=None):
+    conn = conn or get_connection()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for target, statements in MIGRATIONS:
+        if target <= version:
+            continue
+        try:
+            conn.execute("BEGIN")
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {int(target)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = target
+    return version
+
 # Initialize all databases
 def init_databases():
-    conn = sqlite3.connect("health_system.db")
-    cursor = conn.cursor()
-
-    # Users table for authentication
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT UNIQUE NOT NULL,
-        password TEXT NOT NULL,
-        role TEXT NOT NULL
-    )
-    """)
-
-    # Patients table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS patients (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL,
-        age INTEGER NOT NULL,
-        gender TEXT NOT NULL,
-        contact TEXT NOT NULL
-    )
-    """)
-
-    # Doctors table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS doctors (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT NOT NULL,
-        specialty TEXT NOT NULL,
-        availability TEXT NOT NULL
-    )
-    """)
-
-    # Invoices table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS invoices (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        patient_id INTEGER NOT NULL,
-        amount REAL NOT NULL,
-        status TEXT NOT NULL,
-        date TEXT NOT NULL,
-        FOREIGN KEY(patient_id) REFERENCES patients(id)
-    )
-    """)
-
-    # Prescriptions table
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS prescriptions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        patient_id INTEGER NOT NULL,
-        doctor TEXT NOT NULL,
-        prescription TEXT NOT NULL,
-        date TEXT NOT NULL,
-        FOREIGN KEY(patient_id) REFERENCES patients(id)
-    )
-    """)
-    conn.commit()
-    conn.close()
+    run_migrations()
 
 # User Authentication System
 def register_user():
@@ -72,21 +321,20 @@ def register_user():
     password = input("Enter password: ")
     role = input("Enter role (admin/doctor/patient): ").lower()
     hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-    conn = sqlite3.connect("health_system.db")
+    conn = get_connection()
     cursor = conn.cursor()
     try:
-        cursor.execute("INSERT INTO users (username, password, role) VALUES (?, ?, ?)",
-                       (username, hashed_password, role))
-        conn.commit()
+        with conn:
+            cursor.execute("INSERT INTO users (username, password, role) VALUES (?, ?, ?)",
+                           (username, hashed_password, role))
         print("User registered successfully!")
     except sqlite3.IntegrityError:
         print("Username already exists!")
-    conn.close()
 
 def login_user():
     username = input("Enter username: ")
     password = input("Enter password: ")
-    conn = sqlite3.connect("health_system.db")
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT password, role FROM users WHERE username = ?", (username,))
     result = cursor.fetchone()
@@ -97,94 +345,161 @@ def login_user():
         print("Invalid username or password!")
         return None
 
+# Paginated Queries
+# Each page_* function returns (rows, next_cursor). Pass next_cursor back as `after` to get the
+# following page; it is None on the last page. Cursors are (sort value, id) pairs, so pages stay
+# stable while rows are inserted and each page costs one index range scan however deep it is.
+# Date ranges are half-open: start <= value < end.
+PAGE_SIZE = 50
+
+def _keyset_page(base_query, sort_column, id_column, sort_index, conditions, params, after, limit):
+    if limit < 1:
+        raise ValueError(f"Page limit must be at least 1, got {limit}")
+    conditions, params = list(conditions), list(params)
+    if after is not None:
+        conditions.append(f"({sort_column}, {id_column}) > (?, ?)")
+        params.extend(after)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    rows = get_connection().execute(f"{base_query} {where} ORDER BY {sort_column}, {id_column} LIMIT ?",
+                                    (*params, limit + 1)).fetchall()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, (rows[-1][sort_index], rows[-1][0])
+
+# Build WHERE conditions from the filters that were given
+def _filters(*pairs):
+    conditions, params = [], []
+    for condition, value in pairs:
+        if value is not None:
+            conditions.append(condition)
+            params.append(value)
+    return conditions, params
+
+def page_invoices(status=None, patient_id=None, start=None, end=None, after=None, limit=PAGE_SIZE):
+    conditions, params = _filters(("i.status = ?", status), ("i.patient_id = ?", patient_id),
+                                  ("i.date >= ?", start), ("i.date < ?", end))
+    return _keyset_page(INVOICES_PAGE_QUERY, "i.date", "i.id", 4, conditions, params, after, limit)
+
+def page_doctors(specialty=None, after=None, limit=PAGE_SIZE):
+    conditions, params = _filters(("specialty = ?", specialty))
+    return _keyset_page(DOCTORS_PAGE_QUERY, "name", "id", 1, conditions, params, after, limit)
+
+def page_reminders(status=None, patient_id=None, start=None, end=None, after=None, limit=PAGE_SIZE):
+    conditions, params = _filters(("r.status = ?", status), ("r.patient_id = ?", patient_id),
+                                  ("r.reminder_time >= ?", start), ("r.reminder_time < ?", end))
+    return _keyset_page(REMINDERS_PAGE_QUERY, "r.reminder_time", "r.id", 3, conditions, params, after, limit)
+
+# Lazily iterate every matching row, fetching page_size rows per query
+def _iter_pages(page_function, page_size, filters):
+    after = None
+    while True:
+        rows, after = page_function(after=after, limit=page_size, **filters)
+        yield from rows
+        if after is None:
+            return
+
+def iter_invoices(page_size=500, **filters):
+    return _iter_pages(page_invoices, page_size, filters)
+
+def iter_doctors(page_size=500, **filters):
+    return _iter_pages(page_doctors, page_size, filters)
+
+def iter_reminders(page_size=500, **filters):
+    return _iter_pages(page_reminders, page_size, filters)
+
+# Print one page at a time, asking before fetching the next
+def _print_pages(page_function, render, **filters):
+    after = None
+    while True:
+        rows, after = page_function(after=after, **filters)
+        for row in rows:
+            print(render(row))
+        if after is None or input("Show more? (y/n): ").strip().lower() != "y":
+            break
+
 # Billing and Invoicing System
 def add_invoice():
     patient_id = int(input("Enter patient ID: "))
     amount = float(input("Enter amount to be billed: "))
     status = input("Enter payment status (paid/unpaid): ").lower()
-    conn = sqlite3.connect("health_system.db")
+    conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("INSERT INTO invoices (patient_id, amount, status, date) VALUES (?, ?, ?, ?)",
-                   (patient_id, amount, status, datetime.now().strftime("%Y-%m-%d")))
-    conn.commit()
-    print("Invoice added successfully!")
-    conn.close()
+    try:
+        with conn:
+            cursor.execute("INSERT INTO invoices (patient_id, amount, status, date) VALUES (?, ?, ?, ?)",
+                           (patient_id, amount, status, datetime.now().strftime("%Y-%m-%d")))
+        print("Invoice added successfully!")
+    except sqlite3.IntegrityError:
+        print("Patient not found!")
 
 def view_invoices():
-    conn = sqlite3.connect("health_system.db")
-    cursor = conn.cursor()
-    cursor.execute("""
-    SELECT i.id, p.name, i.amount, i.status, i.date
-    FROM invoices i
-    JOIN patients p ON i.patient_id = p.id
-    """)
-    invoices = cursor.fetchall()
     print("\n--- Invoices ---")
-    for invoice in invoices:
-        print(f"ID: {invoice[0]}, Patient: {invoice[1]}, Amount: {invoice[2]}, Status: {invoice[3]}, Date: {invoice[4]}")
-    conn.close()
+    _print_pages(page_invoices, lambda invoice: f"ID: {invoice[0]}, Patient: {invoice[1]}, Amount: {invoice[2]}, "
+                                                f"Status: {invoice[3]}, Date: {invoice[4]}")
 
 # Prescription Management
 def add_prescription():
     patient_id = int(input("Enter patient ID: "))
     doctor = input("Enter doctor's name: ")
     prescription = input("Enter prescription details: ")
-    conn = sqlite3.connect("health_system.db")
+    conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("INSERT INTO prescriptions (patient_id, doctor, prescription, date) VALUES (?, ?, ?, ?)",
-                   (patient_id, doctor, prescription, datetime.now().strftime("%Y-%m-%d")))
-    conn.commit()
-    print("Prescription added successfully!")
-    conn.close()
+    try:
+        with conn:
+            cursor.execute("INSERT INTO prescriptions (patient_id, doctor, prescription, date) VALUES (?, ?, ?, ?)",
+                           (patient_id, doctor, prescription, datetime.now().strftime("%Y-%m-%d")))
+        print("Prescription added successfully!")
+    except sqlite3.IntegrityError:
+        print("Patient not found!")
 
 def view_prescriptions():
     patient_id = int(input("Enter patient ID to view prescriptions: "))
-    conn = sqlite3.connect("health_system.db")
+    conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT doctor, prescription, date FROM prescriptions WHERE patient_id = ?", (patient_id,))
+    cursor.execute(PATIENT_PRESCRIPTIONS_QUERY, (patient_id,))
     prescriptions = cursor.fetchall()
     print("\n--- Prescriptions ---")
     for prescription in prescriptions:
         print(f"Doctor: {prescription[0]}, Prescription: {prescription[1]}, Date: {prescription[2]}")
-    conn.close()
 
 # Doctor Management
 def add_doctor():
     name = input("Enter doctor's name: ")
     specialty = input("Enter doctor's specialty: ")
     availability = input("Enter doctor's availability (e.g., Mon-Fri, 10AM-4PM): ")
-    conn = sqlite3.connect("health_system.db")
+    conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("INSERT INTO doctors (name, specialty, availability) VALUES (?, ?, ?)",
-                   (name, specialty, availability))
-    conn.commit()
+    with conn:
+        cursor.execute("INSERT INTO doctors (name, specialty, availability) VALUES (?, ?, ?)",
+                       (name, specialty, availability))
     print("Doctor added successfully!")
-    conn.close()
 
 def view_doctors():
-    conn = sqlite3.connect("health_system.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM doctors")
-    doctors = cursor.fetchall()
     print("\n--- Doctors ---")
-    for doctor in doctors:
-        print(f"ID: {doctor[0]}, Name: {doctor[1]}, Specialty: {doctor[2]}, Availability: {doctor[3]}")
-    conn.close()
+    _print_pages(page_doctors, lambda doctor: f"ID: {doctor[0]}, Name: {doctor[1]}, Specialty: {doctor[2]}, "
+                                              f"Availability: {doctor[3]}")
 
 # Advanced Search
+# Find patients by ID, or by name / contact prefix tokens ranked by relevance
+def find_patients(keyword, limit=20):
+    keyword = keyword.strip()
+    conn = get_connection()
+    if keyword.isdigit():
+        return conn.execute(PATIENT_BY_ID_QUERY, (int(keyword),)).fetchall()
+    tokens = re.findall(r"\w+", keyword)
+    if not tokens:
+        return []
+    # Quote every token so user input can never be read as FTS5 query syntax
+    match = " ".join(f'"{token}"*' for token in tokens)
+    return conn.execute(PATIENT_SEARCH_QUERY, (match, limit)).fetchall()
+
 def search_patients():
     keyword = input("Enter patient name or ID to search: ")
-    conn = sqlite3.connect("health_system.db")
-    cursor = conn.cursor()
-    cursor.execute("""
-    SELECT * FROM patients
-    WHERE name LIKE ? OR id = ?
-    """, (f"%{keyword}%", keyword if keyword.isdigit() else None))
-    patients = cursor.fetchall()
+    patients = find_patients(keyword)
     print("\n--- Search Results ---")
     for patient in patients:
         print(f"ID: {patient[0]}, Name: {patient[1]}, Age: {patient[2]}, Gender: {patient[3]}, Contact: {patient[4]}")
-    conn.close()
 
 def add_reminder():
     title = input("Enter the reminder title (e.g., Appointment, Prescription Refill): ")
@@ -195,70 +510,407 @@ def add_reminder():
     # Combine date and time for the reminder
     reminder_datetime = datetime.strptime(f"{reminder_date} {reminder_time}", "%Y-%m-%d %H:%M")
 
-    conn = sqlite3.connect("health_system.db")
+    conn = get_connection()
     cursor = conn.cursor()
-
-    # Create reminders table if not exists
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS reminders (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        patient_id INTEGER NOT NULL,
-        title TEXT NOT NULL,
-        reminder_time TEXT NOT NULL,
-        status TEXT NOT NULL DEFAULT 'Pending',
-        FOREIGN KEY(patient_id) REFERENCES patients(id)
-    )
-    """)
-    cursor.execute("INSERT INTO reminders (patient_id, title, reminder_time, status) VALUES (?, ?, ?, ?)",
-                   (patient_id, title, reminder_datetime.strftime("%Y-%m-%d %H:%M:%S"), 'Pending'))
-    conn.commit()
-    print("Reminder added successfully!")
-    conn.close()
+    try:
+        with conn:
+            cursor.execute("INSERT INTO reminders (patient_id, title, reminder_time, status) VALUES (?, ?, ?, ?)",
+                           (patient_id, title, reminder_datetime.strftime(TIME_FORMAT), 'Pending'))
+        print("Reminder added successfully!")
+    except sqlite3.IntegrityError:
+        print("Patient not found!")
 
 def view_reminders():
-    conn = sqlite3.connect("health_system.db")
-    cursor = conn.cursor()
-
-    cursor.execute("""
-    SELECT r.id, p.name, r.title, r.reminder_time, r.status
-    FROM reminders r
-    JOIN patients p ON r.patient_id = p.id
-    ORDER BY r.reminder_time ASC
-    """)
-    reminders = cursor.fetchall()
-    
     print("\n--- Upcoming Reminders ---")
+    _print_pages(page_reminders, lambda reminder: f"ID: {reminder[0]}, Patient: {reminder[1]}, Title: {reminder[2]}, "
+                                                  f"Time: {reminder[3]}, Status: {reminder[4]}")
+
+# Default notification sink: print each reminder of a batch
+def print_notifications(reminders):
     for reminder in reminders:
-        print(f"ID: {reminder[0]}, Patient: {reminder[1]}, Title: {reminder[2]}, Time: {reminder[3]}, Status: {reminder[4]}")
-    conn.close()
+        print(f"Reminder ID: {reminder[0]}, Patient: {reminder[1]}, Title: {reminder[2]}, Time: {reminder[3]}")
+
+# Deliver a batch of reminders and mark them notified. The batch is claimed in one short
+# transaction and the sink runs with no lock held, so a slow sink never blocks other writers.
+# Rows that are no longer pending are skipped; if the sink raises, the batch is released back
+# to pending and the error propagates.
+def notify_reminders(reminder_ids, sink=print_notifications):
+    if not reminder_ids:
+        return []
+    conn = get_connection()
+    with conn:
+        claimed = [row[0] for row in conn.execute(CLAIM_REMINDERS_QUERY, (json.dumps(list(reminder_ids)),))]
+        if not claimed:
+            return []
+        claimed = json.dumps(claimed)
+        reminders = conn.execute(CLAIMED_REMINDERS_QUERY, (claimed,)).fetchall()
+    try:
+        sink(reminders)
+    except Exception:
+        with conn:
+            conn.execute(RELEASE_CLAIMED_QUERY, (claimed,))
+        raise
+    with conn:
+        conn.execute(MARK_NOTIFIED_QUERY, (claimed,))
+    return reminders
+
+# Return reminders stuck in 'Notifying' to 'Pending'; only safe while no dispatcher is running
+def release_stale_claims():
+    conn = get_connection()
+    with conn:
+        return conn.execute(RELEASE_STALE_CLAIMS_QUERY).rowcount
 
 def trigger_notifications():
-    conn = sqlite3.connect("health_system.db")
+    conn = get_connection()
     cursor = conn.cursor()
 
     current_time = datetime.now()
     next_hour = current_time + timedelta(hours=1)
 
-    cursor.execute("""
-    SELECT r.id, p.name, r.title, r.reminder_time
-    FROM reminders r
-    JOIN patients p ON r.patient_id = p.id
-    WHERE datetime(r.reminder_time) BETWEEN ? AND ?
-    AND r.status = 'Pending'
-    """, (current_time.strftime("%Y-%m-%d %H:%M:%S"), next_hour.strftime("%Y-%m-%d %H:%M:%S")))
+    cursor.execute(DUE_REMINDERS_QUERY, (current_time.strftime(TIME_FORMAT), next_hour.strftime(TIME_FORMAT)))
 
     upcoming_reminders = cursor.fetchall()
 
     if upcoming_reminders:
         print("\n--- Notifications ---")
-        for reminder in upcoming_reminders:
-            print(f"Reminder ID: {reminder[0]}, Patient: {reminder[1]}, Title: {reminder[2]}, Time: {reminder[3]}")
-            # Update status to "Notified"
-            cursor.execute("UPDATE reminders SET status = 'Notified' WHERE id = ?", (reminder[0],))
-        conn.commit()
+        notify_reminders([reminder[0] for reminder in upcoming_reminders])
     else:
         print("No upcoming reminders in the next hour.")
-    conn.close()
+
+# Long-running reminder dispatcher. Keeps a min-heap of upcoming (reminder_time, id) pairs,
+# loaded a batch at a time with a keyset query, sleeps until the earliest one is within
+# lead_time of now and dispatches everything due as one batch. Reminders added by this
+# process should be passed to schedule(); the periodic resync picks up everything else.
+# Overdue reminders that are still pending (e.g. after downtime) are dispatched immediately.
+class ReminderScheduler:
+    def __init__(self, sink=print_notifications, lead_time=timedelta(hours=1), batch_size=1000,
+                 resync_interval=300.0, retry_delay=1.0, max_retry_delay=60.0):
+        self.sink = sink
+        self.lead_time = lead_time
+        self.batch_size = batch_size
+        self.resync_interval = resync_interval
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.dispatched = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self.resync()
+
+    # Forget the in-memory queue; the next run reloads it from the database
+    def resync(self):
+        with self._lock:
+            self._heap = []
+            self._queued = set()
+            self._cursor = ("", 0)
+            self._exhausted = False
+
+    # Queue a reminder created in this process and wake the scheduler if it is now the earliest
+    def schedule(self, reminder_id, reminder_time):
+        if isinstance(reminder_time, datetime):
+            reminder_time = reminder_time.strftime(TIME_FORMAT)
+        with self._lock:
+            if reminder_id not in self._queued:
+                self._queued.add(reminder_id)
+                heapq.heappush(self._heap, (reminder_time, reminder_id))
+        self.wake()
+
+    def wake(self):
+        self._wake.set()
+
+    # Earliest queued reminder, loading the next batch whenever unloaded rows may sort first
+    def _peek(self):
+        while not self._exhausted and (not self._heap or self._heap[0] > self._cursor):
+            rows = get_connection().execute(PENDING_REMINDERS_QUERY, (*self._cursor, self.batch_size)).fetchall()
+            self._exhausted = len(rows) < self.batch_size
+            if rows:
+                self._cursor = rows[-1]
+            for reminder_time, reminder_id in rows:
+                if reminder_id not in self._queued:
+                    self._queued.add(reminder_id)
+                    heapq.heappush(self._heap, (reminder_time, reminder_id))
+        return self._heap[0] if self._heap else None
+
+    # Dispatch every reminder due by `now` (default: the current time), returning how many were sent.
+    # If a batch fails it is put back on the heap and the error propagates.
+    def run_once(self, now=None):
+        horizon = ((now or datetime.now()) + self.lead_time).strftime(TIME_FORMAT)
+        sent = 0
+        while True:
+            with self._lock:
+                due = []
+                while len(due) < self.batch_size:
+                    head = self._peek()
+                    if head is None or head[0] > horizon:
+                        break
+                    heapq.heappop(self._heap)
+                    self._queued.discard(head[1])
+                    due.append(head)
+            if not due:
+                break
+            try:
+                sent += len(notify_reminders([reminder_id for _, reminder_id in due], self.sink))
+            except Exception:
+                with self._lock:
+                    for entry in due:
+                        if entry[1] not in self._queued:
+                            self._queued.add(entry[1])
+                            heapq.heappush(self._heap, entry)
+                self.dispatched += sent
+                raise
+        self.dispatched += sent
+        return sent
+
+    # Seconds until the earliest queued reminder becomes due, or None when nothing is queued
+    def seconds_until_next(self, now=None):
+        with self._lock:
+            head = self._peek()
+        if head is None:
+            return None
+        due_at = datetime.strptime(head[0], TIME_FORMAT) - self.lead_time
+        return max((due_at - (now or datetime.now())).total_seconds(), 0.0)
+
+    def run(self):
+        # Assumes this is the only dispatcher: anything still 'Notifying' was left by a crash
+        release_stale_claims()
+        next_resync = time.monotonic() + self.resync_interval
+        while not self._stop.is_set():
+            if time.monotonic() >= next_resync:
+                self.resync()
+                next_resync = time.monotonic() + self.resync_interval
+            # Clear before dispatching so a wake() that arrives meanwhile is not lost
+            self._wake.clear()
+            try:
+                self.run_once()
+                wait = next_resync - time.monotonic()
+                until_due = self.seconds_until_next()
+                if until_due is not None:
+                    wait = min(wait, until_due)
+                self.failures = 0
+            except Exception as e:
+                # Keep the thread alive; the failed batch is back on the heap, retry with backoff
+                self.failures += 1
+                wait = min(self.retry_delay * 2 ** (self.failures - 1), self.max_retry_delay)
+                print(f"Error dispatching reminders (attempt {self.failures}, retrying in {wait:.1f}s): {e}")
+            self._wake.wait(max(wait, 0.0))
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="reminder-scheduler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+# Bulk Import and Export
+# Columns accepted by import_rows and written by export_rows. Imported rows may leave out "id"
+# (a new one is assigned) and any column listed in COLUMN_DEFAULTS.
+TABLE_COLUMNS = {
+    "patients": ("id", "name", "age", "gender", "contact"),
+    "doctors": ("id", "name", "specialty", "availability"),
+    "invoices": ("id", "patient_id", "amount", "status", "date"),
+    "prescriptions": ("id", "patient_id", "doctor", "prescription", "date"),
+    "reminders": ("id", "patient_id", "title", "reminder_time", "status"),
+}
+
+COLUMN_DEFAULTS = {"reminders": {"status": "Pending"}}
+
+EXISTING_PATIENTS_QUERY = """
+SELECT id FROM patients WHERE id IN (SELECT value FROM json_each(?))
+"""
+
+# Rejected rows beyond this many are counted but not described
+MAX_REPORTED_ERRORS = 100
+
+# Errors that reject a single row rather than abort the import (constraint or binding failures)
+ROW_ERRORS = (sqlite3.IntegrityError, sqlite3.InterfaceError, sqlite3.ProgrammingError)
+
+# Converters for imported values; each raises TypeError or ValueError on bad input
+def _as_int(value):
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(value)
+    value = int(value)
+    if not -2 ** 63 <= value < 2 ** 63:
+        raise ValueError(value)
+    return value
+
+def _as_float(value):
+    if isinstance(value, bool):
+        raise ValueError(value)
+    value = float(value)
+    if value != value or value in (float("inf"), float("-inf")):
+        raise ValueError(value)
+    return value
+
+def _as_text(value):
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise TypeError(value)
+    return str(value)
+
+# Dates must be YYYY-MM-DD and reminder times YYYY-MM-DD HH:MM:SS; both are zero-padded on the way in
+DATE_PATTERN = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+TIME_PATTERN = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2}) (\d{1,2}):(\d{1,2}):(\d{1,2})")
+
+def _as_date(value):
+    match = DATE_PATTERN.fullmatch(value)
+    if not match:
+        raise ValueError(value)
+    return date(*map(int, match.groups())).isoformat()
+
+def _as_time(value):
+    match = TIME_PATTERN.fullmatch(value)
+    if not match:
+        raise ValueError(value)
+    return datetime(*map(int, match.groups())).isoformat(" ")
+
+# Columns not listed here are text
+COLUMN_CONVERTERS = {
+    "id": _as_int,
+    "patient_id": _as_int,
+    "age": _as_int,
+    "amount": _as_float,
+    "date": _as_date,
+    "reminder_time": _as_time,
+}
+
+def _table_columns(table):
+    if table not in TABLE_COLUMNS:
+        raise ValueError(f"Unknown table {table!r}; expected one of: {', '.join(TABLE_COLUMNS)}")
+    return TABLE_COLUMNS[table]
+
+def _file_format(path, fmt):
+    if fmt:
+        return fmt
+    return "jsonl" if path.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+# Stream (line number, record, parse error) from a CSV file with a header row or a JSON Lines file
+def _read_records(path, fmt, columns):
+    with open(path, newline="", encoding="utf-8") as file:
+        if fmt == "csv":
+            reader = csv.DictReader(file)
+            unknown = [name for name in reader.fieldnames or [] if name not in columns]
+            if unknown:
+                raise ValueError(f"Unknown columns in {path}: {', '.join(unknown)}")
+            for record in reader:
+                yield reader.line_num, record, None
+        else:
+            for number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, json.loads(line), None
+                except ValueError as e:
+                    yield number, None, f"invalid JSON: {e}"
+
+# Turn a record into a value tuple in TABLE_COLUMNS order, or explain why it is rejected
+def _prepare_row(table, columns, record):
+    if not isinstance(record, dict):
+        return None, "record is not an object"
+    unknown = [str(name) for name in record if name not in columns]
+    if unknown:
+        return None, f"unknown columns: {', '.join(unknown)}"
+    defaults = COLUMN_DEFAULTS.get(table, {})
+    values = []
+    for column in columns:
+        value = record.get(column)
+        if value is None or value == "":
+            value = defaults.get(column)
+            if value is None and column != "id":
+                return None, f"missing {column}"
+        else:
+            try:
+                value = COLUMN_CONVERTERS.get(column, _as_text)(value)
+            except (TypeError, ValueError):
+                return None, f"invalid {column}: {value!r}"
+        values.append(value)
+    return tuple(values), None
+
+def _reject(result, number, reason):
+    result["rejected"] += 1
+    if len(result["errors"]) < MAX_REPORTED_ERRORS:
+        result["errors"].append((number, reason))
+
+# Insert one chunk in a single transaction after checking its patient references
+def _insert_chunk(conn, table, columns, chunk, result):
+    if "patient_id" in columns:
+        position = columns.index("patient_id")
+        wanted = json.dumps(list({values[position] for _, values in chunk}))
+        known = {row[0] for row in conn.execute(EXISTING_PATIENTS_QUERY, (wanted,))}
+        valid = []
+        for number, values in chunk:
+            if values[position] in known:
+                valid.append((number, values))
+            else:
+                _reject(result, number, f"patient {values[position]} not found")
+        chunk = valid
+    statement = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    try:
+        with conn:
+            conn.executemany(statement, (values for _, values in chunk))
+        result["inserted"] += len(chunk)
+    except ROW_ERRORS:
+        # Something else in the chunk is invalid (e.g. a duplicate id); retry row by row so
+        # only the offending rows are rejected
+        with conn:
+            for number, values in chunk:
+                try:
+                    conn.execute(statement, values)
+                    result["inserted"] += 1
+                except ROW_ERRORS as e:
+                    _reject(result, number, str(e))
+
+# Stream a CSV or JSON Lines file into a table with executemany, one transaction per chunk.
+# Returns {"inserted", "rejected", "errors"}, where errors holds (line number, reason) pairs
+# for the first MAX_REPORTED_ERRORS rejected rows. progress(result) is called after each chunk.
+def import_rows(table, path, fmt=None, chunk_size=5000, progress=None):
+    columns = _table_columns(table)
+    conn = get_connection()
+    result = {"inserted": 0, "rejected": 0, "errors": []}
+    chunk = []
+    for number, record, error in _read_records(path, _file_format(path, fmt), columns):
+        values, error = (None, error) if error else _prepare_row(table, columns, record)
+        if error:
+            _reject(result, number, error)
+            continue
+        chunk.append((number, values))
+        if len(chunk) >= chunk_size:
+            _insert_chunk(conn, table, columns, chunk, result)
+            chunk = []
+            if progress:
+                progress(result)
+    if chunk:
+        _insert_chunk(conn, table, columns, chunk, result)
+        if progress:
+            progress(result)
+    return result
+
+# Stream a whole table, in id order, to a CSV or JSON Lines file; returns the number of rows
+def export_rows(table, path, fmt=None, chunk_size=5000):
+    columns = _table_columns(table)
+    cursor = get_connection().execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY id")
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = None
+        if _file_format(path, fmt) == "csv":
+            writer = csv.writer(file)
+            writer.writerow(columns)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            if writer:
+                writer.writerows(rows)
+            else:
+                file.writelines(json.dumps(dict(zip(columns, row))) + "\n" for row in rows)
+            count += len(rows)
+    return count
 
 # Main Menu
 def main_menu():
@@ -337,5 +989,46 @@ def main_menu():
 
 # Initialize and run the application
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Health Administration System")
+    parser.add_argument("--db", default=DB_PATH, help="path to the SQLite database")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("menu", help="interactive menu (default)")
+    scheduler_parser = commands.add_parser("scheduler", help="run the reminder scheduler until interrupted")
+    scheduler_parser.add_argument("--lead-minutes", type=float, default=60,
+                                  help="notify this many minutes before a reminder is due")
+    scheduler_parser.add_argument("--resync-seconds", type=float, default=300,
+                                  help="how often to reload pending reminders from the database")
+    import_parser = commands.add_parser("import", help="bulk load a CSV or JSON Lines file into a table")
+    import_parser.add_argument("table", choices=TABLE_COLUMNS)
+    import_parser.add_argument("path")
+    import_parser.add_argument("--format", choices=("csv", "jsonl"), help="default: from the file extension")
+    import_parser.add_argument("--chunk-size", type=int, default=5000, help="rows per transaction")
+    export_parser = commands.add_parser("export", help="write a table to a CSV or JSON Lines file")
+    export_parser.add_argument("table", choices=TABLE_COLUMNS)
+    export_parser.add_argument("path")
+    export_parser.add_argument("--format", choices=("csv", "jsonl"), help="default: from the file extension")
+    args = parser.parse_args()
+
+    configure_database(args.db)
     init_databases()
-    main_menu()
+    if args.command == "import":
+        result = import_rows(args.table, args.path, args.format, args.chunk_size,
+                             progress=lambda r: print(f"\r{r['inserted']} inserted, {r['rejected']} rejected",
+                                                      end="", flush=True))
+        print(f"\nImported {result['inserted']} rows into {args.table}, rejected {result['rejected']}.")
+        for number, reason in result["errors"]:
+            print(f"  line {number}: {reason}")
+        if result["rejected"] > len(result["errors"]):
+            print(f"  ... and {result['rejected'] - len(result['errors'])} more")
+    elif args.command == "export":
+        count = export_rows(args.table, args.path, args.format)
+        print(f"Exported {count} rows from {args.table} to {args.path}.")
+    elif args.command == "scheduler":
+        scheduler = ReminderScheduler(lead_time=timedelta(minutes=args.lead_minutes),
+                                      resync_interval=args.resync_seconds)
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            print(f"Scheduler stopped after {scheduler.dispatched} notifications.")
+    else:
+        main_menu()
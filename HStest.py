@@ -0,0 +1,430 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import HS
+from HS import (
+    configure_database,
+    get_connection,
+    init_databases,
+    run_migrations,
+    find_patients,
+    SCHEMA_VERSION,
+    PATIENT_PRESCRIPTIONS_QUERY,
+    DUE_REMINDERS_QUERY,
+    PATIENT_SEARCH_QUERY,
+    PENDING_REMINDERS_QUERY,
+    CLAIM_REMINDERS_QUERY,
+    CLAIMED_REMINDERS_QUERY,
+    MARK_NOTIFIED_QUERY,
+    ReminderScheduler,
+    notify_reminders,
+    release_stale_claims,
+    import_rows,
+    export_rows,
+    page_invoices,
+    page_doctors,
+    page_reminders,
+    iter_invoices,
+    iter_doctors,
+    iter_reminders,
+)
+
+# Each test runs against its own throwaway database
+def _fresh_database(tmp_dir):
+    configure_database(os.path.join(tmp_dir, "test_health_system.db"))
+    init_databases()
+    return get_connection()
+
+def _query_plan(conn, query, params):
+    return " | ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + query, params))
+
+# Sample test cases
+def test_connection_manager():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = configure_database(os.path.join(tmp_dir, "test_health_system.db"))
+        conn = get_connection()
+        assert get_connection() is conn, "Thread did not reuse its connection"
+        pragmas = [conn.execute(f"PRAGMA {name}").fetchone()[0]
+                   for name in ("journal_mode", "synchronous", "foreign_keys", "temp_store")]
+        assert pragmas == ["wal", 1, 1, 2], f"Pragmas not applied: {pragmas}"
+        seen = []
+        def worker():
+            seen.append((get_connection(), get_connection(), manager.open_connections()))
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+            thread.join()
+        assert all(first is second and first is not conn for first, second, _ in seen), "Threads shared connections"
+        assert [count for _, _, count in seen] == [2, 2, 2, 2], f"Exited threads kept connections: {seen}"
+        assert manager.open_connections() == 1, "Connections of exited threads leaked"
+        try:
+            seen[0][0].execute("SELECT 1")
+            assert False, "Connection of an exited thread still open"
+        except sqlite3.ProgrammingError:
+            pass
+        HS.db.close_all()
+        assert manager.open_connections() == 0, "close_all left connections open"
+    print("Connection manager test passed.")
+
+def test_migrations():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        legacy_path = os.path.join(tmp_dir, "legacy.db")
+        legacy = sqlite3.connect(legacy_path)
+        legacy.execute("CREATE TABLE patients (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, "
+                       "age INTEGER NOT NULL, gender TEXT NOT NULL, contact TEXT NOT NULL)")
+        legacy.execute("INSERT INTO patients (name, age, gender, contact) VALUES ('Ann Lee', 40, 'F', '555')")
+        legacy.commit()
+        legacy.close()
+        configure_database(legacy_path)
+        assert run_migrations() == SCHEMA_VERSION, "Migrations did not reach the latest version"
+        assert run_migrations() == SCHEMA_VERSION, "Re-running migrations failed"
+        conn = get_connection()
+        assert conn.execute("SELECT name FROM patients").fetchone() == ("Ann Lee",), "Migration lost data"
+        assert conn.execute("SELECT COUNT(*) FROM reminders").fetchone() == (0,), "Reminders table missing"
+        HS.db.close_all()
+    print("Migrations test passed.")
+
+def test_query_plans_use_indexes():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = _fresh_database(tmp_dir)
+        plan = _query_plan(conn, PATIENT_PRESCRIPTIONS_QUERY, (1,))
+        assert "USING INDEX idx_prescriptions_patient" in plan, f"Prescription lookup scans: {plan}"
+        plan = _query_plan(conn, DUE_REMINDERS_QUERY, ("2024-01-01 00:00:00", "2024-01-01 01:00:00"))
+        assert "idx_reminders_status_time (status=? AND reminder_time>? AND reminder_time<?)" in plan, \
+            f"Due reminder lookup scans: {plan}"
+        plan = _query_plan(conn, PATIENT_SEARCH_QUERY, ('"ann"*', 20))
+        assert "SCAN patients_fts VIRTUAL TABLE" in plan and "SEARCH p USING INTEGER PRIMARY KEY" in plan, \
+            f"Patient search scans: {plan}"
+        plan = _query_plan(conn, PENDING_REMINDERS_QUERY, ("", 0, 100))
+        assert "COVERING INDEX idx_reminders_status_time (status=? AND reminder_time>?)" in plan and "TEMP B-TREE" not in plan, \
+            f"Pending reminder scan sorts or scans: {plan}"
+        for query, index in ((HS.INVOICES_PAGE_QUERY + "WHERE i.status = ? AND (i.date, i.id) > (?, ?) "
+                              "ORDER BY i.date, i.id LIMIT 51", "idx_invoices_status_date"),
+                             (HS.DOCTORS_PAGE_QUERY + "WHERE (name, id) > (?, ?) ORDER BY name, id LIMIT 51",
+                              "idx_doctors_name"),
+                             (HS.REMINDERS_PAGE_QUERY + "WHERE r.patient_id = ? AND (r.reminder_time, r.id) > (?, ?) "
+                              "ORDER BY r.reminder_time, r.id LIMIT 51", "idx_reminders_patient_time")):
+            plan = _query_plan(conn, query, (1, "x", 1)[-query.count("?"):])
+            assert index in plan and "TEMP B-TREE" not in plan, f"Page query sorts or scans: {plan}"
+        for query in (CLAIM_REMINDERS_QUERY, CLAIMED_REMINDERS_QUERY, MARK_NOTIFIED_QUERY):
+            plan = _query_plan(conn, query, ("[1, 2]",))
+            assert "USING INTEGER PRIMARY KEY (rowid=?)" in plan and "SCAN r" not in plan, \
+                f"Batch statement scans: {plan}"
+        HS.db.close_all()
+    print("Query plan test passed.")
+
+def test_find_patients():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = _fresh_database(tmp_dir)
+        with conn:
+            conn.executemany("INSERT INTO patients (name, age, gender, contact) VALUES (?, ?, ?, ?)", [
+                ("Ann Lee", 40, "F", "555-0101"),
+                ("Annabel Lee Lee", 31, "F", "555-0102"),
+                ("Bob O'Brien", 58, "M", "bob@example.com"),
+                ("José Álvarez", 22, "M", "555-0199"),
+            ])
+        assert {row[1] for row in find_patients("ann")} == {"Ann Lee", "Annabel Lee Lee"}, "Prefix search failed"
+        assert find_patients("lee")[0][1] == "Annabel Lee Lee", "Results are not ranked"
+        assert len(find_patients("lee", limit=1)) == 1, "Limit ignored"
+        assert find_patients("2") == [(2, "Annabel Lee Lee", 31, "F", "555-0102")], "ID lookup failed"
+        assert [row[1] for row in find_patients('o"brien')] == ["Bob O'Brien"], "Quoting failed"
+        assert [row[1] for row in find_patients("jose")] == ["José Álvarez"], "Diacritics not folded"
+        assert [row[1] for row in find_patients("0199")] == [], "Numeric input should only match IDs"
+        assert [row[1] for row in find_patients("example")] == ["Bob O'Brien"], "Contact not indexed"
+        assert find_patients("  ") == [], "Blank search returned rows"
+        with conn:
+            conn.execute("UPDATE patients SET name = 'Robert Smith' WHERE id = 3")
+            conn.execute("DELETE FROM patients WHERE id = 1")
+        assert find_patients("brien") == [] and [row[0] for row in find_patients("robert")] == [3], \
+            "Index out of sync after update"
+        assert [row[1] for row in find_patients("ann")] == ["Annabel Lee Lee"], "Index out of sync after delete"
+        HS.db.close_all()
+    print("Patient search test passed.")
+
+def _add_reminders(conn, times):
+    with conn:
+        conn.execute("INSERT INTO patients (name, age, gender, contact) VALUES ('Ann Lee', 40, 'F', '555')")
+        conn.executemany("INSERT INTO reminders (patient_id, title, reminder_time) VALUES (1, ?, ?)",
+                         [(f"Reminder {i}", t.strftime("%Y-%m-%d %H:%M:%S")) for i, t in enumerate(times)])
+
+def test_reminder_scheduler():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = _fresh_database(tmp_dir)
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        _add_reminders(conn, [now - timedelta(days=1)] + [now + timedelta(minutes=m) for m in range(0, 300, 10)])
+        batches = []
+        scheduler = ReminderScheduler(sink=batches.append, lead_time=timedelta(minutes=30), batch_size=4)
+        # Overdue plus everything up to 12:30 is due: 1 + 4 reminders (12:00 .. 12:30)
+        assert scheduler.run_once(now) == 5, "Wrong number of reminders dispatched"
+        assert [len(batch) for batch in batches] == [4, 1], f"Batches not capped: {batches}"
+        assert scheduler.run_once(now) == 0, "Reminders dispatched twice"
+        assert scheduler.seconds_until_next(now) == 600, "Wrong wait until the next reminder"
+        # A reminder scheduled in-process jumps the queue
+        with conn:
+            reminder_id = conn.execute("INSERT INTO reminders (patient_id, title, reminder_time) VALUES "
+                                       "(1, 'Urgent', '2024-01-01 12:35:00')").lastrowid
+        scheduler.schedule(reminder_id, now + timedelta(minutes=35))
+        assert scheduler.seconds_until_next(now) == 300, "Scheduled reminder not queued"
+        assert scheduler.run_once(now + timedelta(minutes=10)) == 2, "Scheduled reminder not dispatched"
+        assert scheduler.run_once(now + timedelta(days=1)) == 25, "Remaining reminders not dispatched"
+        statuses = dict(conn.execute("SELECT status, COUNT(*) FROM reminders GROUP BY status").fetchall())
+        assert statuses == {"Notified": 32}, f"Statuses not updated: {statuses}"
+        HS.db.close_all()
+    print("Reminder scheduler test passed.")
+
+def test_notify_reminders_failing_sink():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = _fresh_database(tmp_dir)
+        _add_reminders(conn, [datetime(2024, 1, 1)] * 3)
+        def failing_sink(reminders):
+            raise RuntimeError("sink down")
+        try:
+            notify_reminders([1, 2, 3], failing_sink)
+            assert False, "Sink error swallowed"
+        except RuntimeError:
+            pass
+        assert conn.execute("SELECT COUNT(*) FROM reminders WHERE status = 'Pending'").fetchone() == (3,), \
+            "Failed batch was marked notified"
+        assert [r[0] for r in notify_reminders([1, 3, 99], lambda reminders: None)] == [1, 3], "Wrong batch claimed"
+        assert notify_reminders([1, 3], lambda reminders: None) == [], "Notified reminders claimed again"
+        HS.db.close_all()
+    print("Notification sink test passed.")
+
+def test_notify_reminders_sink_runs_unlocked():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = _fresh_database(tmp_dir)
+        _add_reminders(conn, [datetime(2024, 1, 1)] * 2)
+        statuses = []
+        def writing_sink(reminders):
+            # Another writer (no busy timeout) must get the lock while the batch is being delivered
+            other = sqlite3.connect(HS.DB_PATH, timeout=0)
+            with other:
+                other.execute("INSERT INTO patients (name, age, gender, contact) VALUES ('Walk In', 30, 'M', '555')")
+                statuses.extend(row[0] for row in other.execute("SELECT status FROM reminders ORDER BY id"))
+            other.close()
+        assert len(notify_reminders([1, 2], writing_sink)) == 2, "Batch not delivered"
+        assert statuses == ["Notifying", "Notifying"], f"Batch not claimed before delivery: {statuses}"
+        assert conn.execute("SELECT COUNT(*) FROM reminders WHERE status = 'Notified'").fetchone() == (2,), \
+            "Batch not marked notified"
+        with conn:
+            conn.execute("UPDATE reminders SET status = 'Notifying' WHERE id = 1")
+        assert release_stale_claims() == 1, "Stale claim not released"
+        assert conn.execute("SELECT status FROM reminders WHERE id = 1").fetchone() == ("Pending",), \
+            "Stale claim not pending"
+        HS.db.close_all()
+    print("Unlocked sink test passed.")
+
+def test_reminder_scheduler_thread():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = _fresh_database(tmp_dir)
+        _add_reminders(conn, [datetime.now() + timedelta(days=1)])
+        batches = []
+        scheduler = ReminderScheduler(sink=batches.append, lead_time=timedelta(minutes=1)).start()
+        try:
+            with conn:
+                reminder_id = conn.execute("INSERT INTO reminders (patient_id, title, reminder_time) "
+                                           "VALUES (1, 'Now', ?)", (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),)
+                                           ).lastrowid
+            scheduler.schedule(reminder_id, datetime.now())
+            deadline = time.monotonic() + 5
+            while not batches and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            scheduler.stop(timeout=5)
+        assert [[r[2] for r in batch] for batch in batches] == [["Now"]], f"Wake-up not handled: {batches}"
+        HS.db.close_all()
+    print("Reminder scheduler thread test passed.")
+
+def test_bulk_import_export():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = _fresh_database(tmp_dir)
+        patients_path = os.path.join(tmp_dir, "patients.csv")
+        with open(patients_path, "w") as file:
+            file.write("id,name,age,gender,contact\n")
+            file.writelines(f"{i},Patient {i},{20 + i % 50},F,555-{i:04d}\n" for i in range(1, 101))
+            file.write("101,,30,M,555\n")
+        progress = []
+        result = import_rows("patients", patients_path, chunk_size=30, progress=lambda r: progress.append(r["inserted"]))
+        assert (result["inserted"], result["rejected"]) == (100, 1), f"Wrong patient import counts: {result}"
+        assert result["errors"] == [(102, "missing name")], f"Wrong rejection report: {result['errors']}"
+        assert progress == [30, 60, 90, 100], f"Progress not reported per chunk: {progress}"
+        assert [row[0] for row in find_patients("patient 42")] == [42], "Imported patients not searchable"
+
+        invoices_path = os.path.join(tmp_dir, "invoices.jsonl")
+        with open(invoices_path, "w") as file:
+            file.writelines(f'{{"patient_id": {i % 120 + 1}, "amount": {i}.5, "status": "paid", "date": "2024-01-01"}}\n'
+                            for i in range(200))
+            file.write('{"id": 1000, "patient_id": 1, "amount": 1, "status": "paid", "date": "2024-01-01"}\n')
+            file.write('{"id": 1000, "patient_id": 1, "amount": 1, "status": "paid", "date": "2024-01-01"}\n')
+            file.write("not json\n")
+            file.write('{"patient_id": 1, "amount": 1, "status": "paid", "date": "2024-01-01", "note": "x"}\n')
+        result = import_rows("invoices", invoices_path, chunk_size=64)
+        # 20 invoices reference patients 101..120, which do not exist; the second id 1000 is a duplicate
+        assert (result["inserted"], result["rejected"]) == (181, 23), f"Wrong invoice import counts: {result}"
+        reasons = [reason for _, reason in result["errors"]]
+        assert "patient 101 not found" in reasons, "Missing patient not rejected"
+        assert any("UNIQUE" in reason for reason in reasons), "Duplicate id not rejected"
+        assert any(reason.startswith("invalid JSON") for reason in reasons), "Bad JSON not rejected"
+        assert "unknown columns: note" in reasons, "Unknown column not rejected"
+        assert conn.execute("SELECT COUNT(*) FROM invoices").fetchone()[0] == result["inserted"], \
+            "Insert count does not match the table"
+
+        for path in (os.path.join(tmp_dir, "out.csv"), os.path.join(tmp_dir, "out.jsonl")):
+            assert export_rows("patients", path, chunk_size=7) == 100, "Wrong export count"
+            configure_database(os.path.join(tmp_dir, os.path.basename(path) + ".db"))
+            init_databases()
+            assert import_rows("patients", path)["inserted"] == 100, "Exported file does not import"
+            copy = get_connection().execute("SELECT * FROM patients ORDER BY id").fetchall()
+            configure_database(os.path.join(tmp_dir, "test_health_system.db"))
+            assert copy == get_connection().execute("SELECT * FROM patients ORDER BY id").fetchall(), \
+                "Round trip changed the data"
+        HS.db.close_all()
+    print("Bulk import/export test passed.")
+
+def test_keyset_pagination():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = _fresh_database(tmp_dir)
+        with conn:
+            conn.executemany("INSERT INTO patients (name, age, gender, contact) VALUES (?, 40, 'F', '555')",
+                             [(f"Patient {i}",) for i in range(5)])
+            # Few distinct sort values, so ties have to be broken by id
+            conn.executemany("INSERT INTO invoices (patient_id, amount, status, date) VALUES (?, ?, ?, ?)",
+                             [(i % 5 + 1, i, ("paid", "unpaid")[i % 2], f"2024-01-{i % 7 + 1:02d}") for i in range(137)])
+            conn.executemany("INSERT INTO doctors (name, specialty, availability) VALUES (?, ?, 'Mon-Fri')",
+                             [(f"Dr {i % 9}", ("Cardiology", "Pediatrics")[i % 2]) for i in range(40)])
+            conn.executemany("INSERT INTO reminders (patient_id, title, reminder_time, status) VALUES (?, ?, ?, ?)",
+                             [(i % 5 + 1, f"R{i}", f"2024-01-01 {i % 4:02d}:00:00", ("Pending", "Notified")[i % 3 == 0])
+                              for i in range(60)])
+
+        def expected(query, params=()):
+            return conn.execute(query, params).fetchall()
+
+        pages, after = [], None
+        while True:
+            rows, after = page_invoices(status="paid", after=after, limit=10)
+            pages.append(rows)
+            if after is None:
+                break
+        assert [len(page) for page in pages] == [10] * 6 + [9], f"Wrong page sizes: {[len(p) for p in pages]}"
+        assert [row for page in pages for row in page] == expected(
+            "SELECT i.id, p.name, i.amount, i.status, i.date FROM invoices i JOIN patients p ON i.patient_id = p.id "
+            "WHERE i.status = 'paid' ORDER BY i.date, i.id"), "Paged invoices differ from a full query"
+        assert list(iter_invoices(page_size=7, patient_id=2, start="2024-01-03", end="2024-01-06")) == expected(
+            "SELECT i.id, p.name, i.amount, i.status, i.date FROM invoices i JOIN patients p ON i.patient_id = p.id "
+            "WHERE i.patient_id = 2 AND i.date >= '2024-01-03' AND i.date < '2024-01-06' ORDER BY i.date, i.id"), \
+            "Invoice filters not applied"
+        assert list(iter_doctors(page_size=4, specialty="Cardiology")) == expected(
+            "SELECT * FROM doctors WHERE specialty = 'Cardiology' ORDER BY name, id"), "Doctor pages wrong"
+        assert list(iter_reminders(page_size=6, status="Pending")) == expected(
+            "SELECT r.id, p.name, r.title, r.reminder_time, r.status FROM reminders r "
+            "JOIN patients p ON r.patient_id = p.id WHERE r.status = 'Pending' ORDER BY r.reminder_time, r.id"), \
+            "Reminder pages wrong"
+        assert page_doctors(limit=40)[1] is None and page_doctors(limit=39)[1] is not None, \
+            "Cursor returned for the last page"
+        for limit in (0, -1):
+            try:
+                page_invoices(limit=limit)
+                assert False, f"limit={limit} accepted"
+            except ValueError:
+                pass
+        try:
+            list(iter_reminders(page_size=0))
+            assert False, "page_size=0 accepted"
+        except ValueError:
+            pass
+
+        # Rows inserted before the cursor do not shift or repeat later pages
+        first, after = page_reminders(limit=20)
+        with conn:
+            conn.execute("INSERT INTO reminders (patient_id, title, reminder_time) VALUES (1, 'Early', '2023-12-31 00:00:00')")
+        rest = list(_iter_from(page_reminders, after))
+        assert len(first) + len(rest) == 60 and not {r[0] for r in first} & {r[0] for r in rest}, \
+            "Pages shifted after an insert"
+        HS.db.close_all()
+    print("Keyset pagination test passed.")
+
+def _iter_from(page_function, after):
+    while after is not None:
+        rows, after = page_function(after=after)
+        yield from rows
+
+def test_reminder_scheduler_survives_failing_sink():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = _fresh_database(tmp_dir)
+        _add_reminders(conn, [datetime.now() - timedelta(minutes=5)] * 2)
+        batches, attempts = [], []
+        def flaky_sink(reminders):
+            attempts.append(len(reminders))
+            if len(attempts) < 3:
+                raise RuntimeError("sink down")
+            batches.append(reminders)
+        scheduler = ReminderScheduler(sink=flaky_sink, retry_delay=0.01).start()
+        try:
+            deadline = time.monotonic() + 5
+            while not batches and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert scheduler._thread.is_alive(), "Scheduler thread died"
+        finally:
+            scheduler.stop(timeout=5)
+        assert attempts == [2, 2, 2], f"Failed batch not retried: {attempts}"
+        assert scheduler.dispatched == 2 and scheduler.failures == 0, "Retry not counted"
+        assert conn.execute("SELECT COUNT(*) FROM reminders WHERE status = 'Notified'").fetchone() == (2,), \
+            "Retried batch not marked notified"
+        HS.db.close_all()
+    print("Scheduler failure recovery test passed.")
+
+def test_bulk_import_validates_types():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        conn = _fresh_database(tmp_dir)
+        patients_path = os.path.join(tmp_dir, "patients.csv")
+        with open(patients_path, "w") as file:
+            file.write("name,age,gender,contact\nAnn Lee,41,F,555\nBob Ray,forty,M,555\n")
+        result = import_rows("patients", patients_path)
+        assert (result["inserted"], result["errors"]) == (1, [(3, "invalid age: 'forty'")]), f"Age not checked: {result}"
+        assert conn.execute("SELECT age, typeof(age) FROM patients").fetchone() == (41, "integer"), "Age not converted"
+
+        invoices_path = os.path.join(tmp_dir, "invoices.csv")
+        with open(invoices_path, "w") as file:
+            file.write("patient_id,amount,status,date\n1,12.50,paid,2024-1-5\n1,N/A,paid,2024-01-05\n"
+                       "1,10,paid,yesterday\n1,nan,paid,2024-01-05\n")
+        result = import_rows("invoices", invoices_path)
+        assert result["inserted"] == 1 and [reason for _, reason in result["errors"]] == [
+            "invalid amount: 'N/A'", "invalid date: 'yesterday'", "invalid amount: 'nan'"], f"CSV rows not checked: {result}"
+        assert conn.execute("SELECT amount, typeof(amount), date FROM invoices").fetchall() == [(12.5, "real", "2024-01-05")], \
+            "Invoice values not normalised"
+
+        reminders_path = os.path.join(tmp_dir, "reminders.jsonl")
+        with open(reminders_path, "w") as file:
+            file.write('{"patient_id": 1, "title": {"x": 1}, "reminder_time": "2024-01-01 09:00:00"}\n')
+            file.write('{"patient_id": 1, "title": "Refill", "reminder_time": "2024-01-01"}\n')
+            file.write('{"patient_id": true, "title": "Refill", "reminder_time": "2024-01-01 09:00:00"}\n')
+            file.write('{"patient_id": 1.0, "title": "Refill", "reminder_time": "2024-01-01 09:00:00"}\n')
+        result = import_rows("reminders", reminders_path)
+        assert result["inserted"] == 1 and result["rejected"] == 3, f"JSON values not checked: {result}"
+        with open(os.path.join(tmp_dir, "invoices.jsonl"), "w") as file:
+            file.write('{"patient_id": 1, "amount": {"x": 1}, "status": "paid", "date": "2024-01-05"}\n')
+            file.write('{"patient_id": 1, "amount": 3, "status": "paid", "date": "2024-01-06"}\n')
+        result = import_rows("invoices", os.path.join(tmp_dir, "invoices.jsonl"))
+        assert (result["inserted"], result["rejected"]) == (1, 1), f"Unbindable value aborted the import: {result}"
+        HS.db.close_all()
+    print("Bulk import validation test passed.")
+
+if __name__ == "__main__":
+    print("Running tests...")
+    test_connection_manager()
+    test_migrations()
+    test_query_plans_use_indexes()
+    test_find_patients()
+    test_reminder_scheduler()
+    test_notify_reminders_failing_sink()
+    test_notify_reminders_sink_runs_unlocked()
+    test_reminder_scheduler_thread()
+    test_reminder_scheduler_survives_failing_sink()
+    test_bulk_import_export()
+    test_bulk_import_validates_types()
+    test_keyset_pagination()
+    print("All tests passed.")